@@ -0,0 +1,271 @@
+"""
+Local Anthropic Messages API Stub
+A stand-in for api.anthropic.com that answers /v1/messages with a small landing page and reports
+prompt cache reads and writes the way the real API does, so prompt layout, caching and streaming
+can be checked offline and without spending tokens. Like the real model, the reply is wrapped in
+a markdown fence with a remark after it, so stop sequences and output cleanup get exercised.
+
+Usage:
+    python3 anthropic_stub.py --port 8765
+    ANTHROPIC_BASE_URL=http://127.0.0.1:8765 ANTHROPIC_API_KEY=stub streamlit run streamlit_app.py
+    python3 anthropic_stub.py --check sherrod-sports-visas
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import threading
+import time
+import uuid
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# Rough token count for usage reporting; the real tokenizer averages about 4 characters per token
+CHARS_PER_TOKEN = 4
+
+STUB_PAGE = """<!DOCTYPE html>
+<html lang="en">
+<head>
+<meta charset="UTF-8">
+<meta name="viewport" content="width=device-width, initial-scale=1.0">
+<title>Stub Landing Page</title>
+<style>body {{ font-family: sans-serif; margin: 0; }} .hero {{ padding: 4rem 2rem; text-align: center; }}</style>
+</head>
+<body>
+<section class="hero">
+<h1>Stub landing page</h1>
+<p>Generated by anthropic_stub.py for prompt {prompt_hash}.</p>
+</section>
+</body>
+</html>"""
+
+# What the model tends to wrap a page in when asked for HTML only
+STUB_REPLY = "```html\n{page}\n```\n\nThis page is a stub response with inline CSS."
+
+# Streamed replies are sent in chunks of about this many characters
+STREAM_CHUNK_CHARS = 48
+
+
+def estimate_tokens(text):
+    return max(1, len(text) // CHARS_PER_TOKEN)
+
+
+def prompt_blocks(body):
+    """The request's prompt as an ordered list of blocks, the order the API caches in: system, then messages"""
+    blocks = []
+    system = body.get('system') or []
+    if isinstance(system, str):
+        system = [{"type": "text", "text": system}]
+    blocks.extend(system)
+    for message in body.get('messages', []):
+        content = message['content']
+        if isinstance(content, str):
+            content = [{"type": "text", "text": content}]
+        for block in content:
+            blocks.append(dict(block, role=message['role']))
+    return blocks
+
+
+class PromptCache:
+    """Prefixes ending at a cache_control breakpoint, kept for ttl seconds after their last use"""
+
+    def __init__(self, ttl=300, min_tokens=1024):
+        self.ttl = ttl
+        self.min_tokens = min_tokens
+        self._entries = {}
+        self._lock = threading.Lock()
+
+    def usage(self, model, blocks):
+        """Return (input_tokens, cache_creation_input_tokens, cache_read_input_tokens) for a request"""
+        digest = hashlib.sha256(model.encode())
+        tokens = 0
+        breakpoints = []  # (prefix digest, tokens up to and including the block)
+        for block in blocks:
+            cacheable = {key: value for key, value in block.items() if key != 'cache_control'}
+            digest.update(json.dumps(cacheable, sort_keys=True).encode())
+            tokens += estimate_tokens(block.get('text', ''))
+            if block.get('cache_control'):
+                breakpoints.append((digest.hexdigest(), tokens))
+
+        now = time.monotonic()
+        read = written = 0
+        with self._lock:
+            for key, prefix_tokens in breakpoints:
+                if prefix_tokens < self.min_tokens:
+                    continue
+                expires = self._entries.get(key)
+                if expires and expires > now:
+                    read = prefix_tokens
+                    written = 0  # A longer cached prefix supersedes any write for a shorter one
+                else:
+                    written = prefix_tokens - read
+                self._entries[key] = now + self.ttl
+
+        return tokens - read - written, written, read
+
+
+def make_handler(cache, latency, tokens_per_second):
+    """Request handler class answering the Messages API from the given prompt cache"""
+
+    class MessagesHandler(BaseHTTPRequestHandler):
+        def do_POST(self):
+            if self.path.split('?')[0] != '/v1/messages':
+                self.send_error(404)
+                return
+
+            body = json.loads(self.rfile.read(int(self.headers.get('Content-Length', 0))))
+            blocks = prompt_blocks(body)
+            input_tokens, cache_written, cache_read = cache.usage(body.get('model', ''), blocks)
+            prompt_hash = hashlib.sha256(json.dumps(blocks, sort_keys=True).encode()).hexdigest()[:12]
+            text = STUB_REPLY.format(page=STUB_PAGE.format(prompt_hash=prompt_hash))
+
+            # Generation ends at the first stop sequence, which is not part of the output
+            stop_reason, stop_sequence = "end_turn", None
+            for sequence in body.get('stop_sequences') or []:
+                position = text.find(sequence)
+                if position != -1:
+                    text, stop_reason, stop_sequence = text[:position], "stop_sequence", sequence
+
+            output_tokens = estimate_tokens(text)
+            usage = {
+                "input_tokens": input_tokens,
+                "cache_creation_input_tokens": cache_written,
+                "cache_read_input_tokens": cache_read,
+                "output_tokens": output_tokens
+            }
+            message = {
+                "id": f"msg_stub_{uuid.uuid4().hex[:24]}",
+                "type": "message",
+                "role": "assistant",
+                "model": body.get('model'),
+                "content": [{"type": "text", "text": text}],
+                "stop_reason": stop_reason,
+                "stop_sequence": stop_sequence,
+                "usage": usage
+            }
+            print(f"{body.get('model')}: {cache_read} tokens read from cache, {cache_written} written, "
+                  f"{input_tokens} uncached{', streamed' if body.get('stream') else ''}")
+
+            time.sleep(latency)
+            if body.get('stream'):
+                self._stream(message, output_tokens)
+                return
+
+            time.sleep(output_tokens / tokens_per_second)
+            response = json.dumps(message).encode()
+            self.send_response(200)
+            self.send_header('Content-Type', 'application/json')
+            self.send_header('Content-Length', str(len(response)))
+            self.end_headers()
+            self.wfile.write(response)
+
+        def _event(self, event, data):
+            self.wfile.write(f"event: {event}\ndata: {json.dumps(data)}\n\n".encode())
+            self.wfile.flush()
+
+        def _stream(self, message, output_tokens):
+            """Send the message as server-sent events, paced at tokens_per_second"""
+            self.send_response(200)
+            self.send_header('Content-Type', 'text/event-stream')
+            self.send_header('Cache-Control', 'no-cache')
+            self.send_header('Connection', 'close')
+            self.end_headers()
+            self.close_connection = True
+
+            text = message['content'][0]['text']
+            start = dict(message, content=[], stop_reason=None, stop_sequence=None,
+                         usage=dict(message['usage'], output_tokens=1))
+            self._event('message_start', {"type": "message_start", "message": start})
+            self._event('content_block_start', {"type": "content_block_start", "index": 0,
+                                                "content_block": {"type": "text", "text": ""}})
+            for offset in range(0, len(text), STREAM_CHUNK_CHARS):
+                chunk = text[offset:offset + STREAM_CHUNK_CHARS]
+                time.sleep(estimate_tokens(chunk) / tokens_per_second)
+                self._event('content_block_delta', {"type": "content_block_delta", "index": 0,
+                                                    "delta": {"type": "text_delta", "text": chunk}})
+            self._event('content_block_stop', {"type": "content_block_stop", "index": 0})
+            self._event('message_delta', {
+                "type": "message_delta",
+                "delta": {"stop_reason": message['stop_reason'], "stop_sequence": message['stop_sequence']},
+                "usage": {"output_tokens": output_tokens}
+            })
+            self._event('message_stop', {"type": "message_stop"})
+
+        def log_message(self, format, *args):
+            pass
+
+    return MessagesHandler
+
+
+def serve(port=0, latency=0.5, tokens_per_second=200, min_tokens=1024):
+    """Start the stub in a background thread and return the server (its port is server.server_port)"""
+    server = ThreadingHTTPServer(('127.0.0.1', port), make_handler(PromptCache(min_tokens=min_tokens),
+                                                                   latency, tokens_per_second))
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def check_prompt_cache(brand_id, philosophy_id='traditional', style='modern'):
+    """
+    Generate a control page and one A/B variation for a brand against a fresh stub and return the
+    two usages. The variation only changes the per-call feedback, so it must read the brand,
+    philosophy and session layers from the prompt cache the control request wrote.
+    """
+    import anthropic
+    from config_loader import ConfigLoader
+    from content_store import VerifiedContentStore
+    from prompts import (VARIANT_ANGLES, build_brand_fragments, cached_messages, landing_page_prefix,
+                         landing_page_session, landing_page_suffix)
+
+    loader = ConfigLoader()
+    brand = loader.brands()[brand_id]
+    philosophy = loader.philosophy()[philosophy_id]
+    fragments = build_brand_fragments(brand, VerifiedContentStore().get(brand_id))
+    cta = {'primary': {'text': brand.ctas['middle'].text, 'url': brand.ctas['middle'].url}}
+    prefix = landing_page_prefix(brand, fragments, philosophy_id, philosophy.prompt_json)
+    session = landing_page_session(brand.colors.as_dict(), style, cta, "Book a free consultation")
+
+    server = serve(latency=0, tokens_per_second=100000)
+    os.environ['ANTHROPIC_BASE_URL'] = f"http://127.0.0.1:{server.server_port}"
+    client = anthropic.Anthropic(api_key=os.environ.get('ANTHROPIC_API_KEY') or 'stub')
+    usages = []
+    try:
+        for feedback in (None, VARIANT_ANGLES['pain']['directive']):
+            system, messages = cached_messages(prefix, session, landing_page_suffix(feedback))
+            response = client.messages.create(model="claude-sonnet-4-20250514", max_tokens=8000,
+                                              system=system, messages=messages)
+            usages.append(response.usage)
+    finally:
+        server.shutdown()
+    return usages
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Local stand-in for the Anthropic Messages API")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--latency-ms", type=float, default=500, help="Delay before the response starts")
+    parser.add_argument("--tokens-per-second", type=float, default=200, help="Simulated output speed")
+    parser.add_argument("--min-cache-tokens", type=int, default=1024,
+                        help="Shortest prefix the cache stores, as for the real API")
+    parser.add_argument("--check", metavar="BRAND_ID",
+                        help="Generate two variations for a brand and fail unless the second "
+                             "reads the prompt cache")
+    args = parser.parse_args()
+
+    if args.check:
+        control, variation = check_prompt_cache(args.check)
+        for name, usage in (("control", control), ("variation", variation)):
+            print(f"{name}: {usage.cache_read_input_tokens} tokens read from cache, "
+                  f"{usage.cache_creation_input_tokens} written, {usage.input_tokens} uncached")
+        if not variation.cache_read_input_tokens:
+            raise SystemExit("FAIL: the second variation did not read the prompt cache")
+        print("OK: the second variation read the cached prompt prefix")
+        raise SystemExit(0)
+
+    server = serve(args.port, args.latency_ms / 1000, args.tokens_per_second, args.min_cache_tokens)
+    print(f"Anthropic stub listening on http://127.0.0.1:{server.server_port}")
+    try:
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        server.shutdown()
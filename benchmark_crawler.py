@@ -0,0 +1,201 @@
+"""
+Offline Crawler Benchmark
+Serves synthetic brand sites from local HTTP servers and crawls them with WebsiteCrawler in
+sync, async and parallel modes, reporting pages/sec, CPU time and peak memory per mode.
+No network access is needed, so crawler performance work is reproducible on a laptop.
+
+Usage:
+    python3 benchmark_crawler.py [--pages 30] [--fan-out 8] [--testimonials 3] [--latency-ms 50]
+    python3 benchmark_crawler.py --modes async parallel --brands 5
+"""
+
+import argparse
+import asyncio
+import contextlib
+import io
+import json
+import subprocess
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+MODES = ('sync', 'async', 'parallel')
+
+FIRST_NAMES = ['Maria', 'James', 'Aisha', 'Chen', 'Lucas', 'Priya', 'Omar', 'Sofia', 'Daniel', 'Yuki']
+SERVICE_NAMES = ['O-1 Visas', 'EB-1 Green Cards', 'P-1 Athlete Visas', 'H-1B Petitions', 'Consultations',
+                 'Appeals', 'Family Visas', 'Workflow Automation']
+PAGE_NAMES = ['about', 'team', 'services', 'testimonials', 'case-studies', 'blog', 'contact', 'pricing']
+
+
+class SyntheticSite:
+    """A deterministic brand site: every page links to fan_out others and carries testimonials, team and services"""
+
+    def __init__(self, name, pages=30, fan_out=8, testimonials=3):
+        self.name = name
+        self.pages = pages
+        self.fan_out = min(fan_out, pages - 1)
+        self.testimonials = testimonials
+
+    def path(self, index):
+        if index == 0:
+            return '/'
+        return f"/{PAGE_NAMES[index % len(PAGE_NAMES)]}/{index}"
+
+    def index_of(self, path):
+        """Page index for a request path, or None if the site has no such page"""
+        if path == '/':
+            return 0
+        suffix = path.rstrip('/').rsplit('/', 1)[-1]
+        if suffix.isdigit() and 0 < int(suffix) < self.pages and self.path(int(suffix)) == path.rstrip('/'):
+            return int(suffix)
+        return None
+
+    def render(self, index):
+        links = ''.join(
+            f'<li><a href="{self.path((index * 7 + step) % self.pages)}">Page {step}</a></li>'
+            for step in range(1, self.fan_out + 1)
+        )
+        testimonials = ''.join(
+            f'<div class="testimonial"><p>Working with {self.name} on page {index} was outstanding; review '
+            f'{number} of {self.testimonials} says they handled every detail of the petition with care.</p>'
+            f'<cite>{FIRST_NAMES[(index + number) % len(FIRST_NAMES)]} {number}</cite></div>'
+            for number in range(self.testimonials)
+        )
+        member = FIRST_NAMES[index % len(FIRST_NAMES)]
+        service = SERVICE_NAMES[index % len(SERVICE_NAMES)]
+        return f"""<!DOCTYPE html>
+<html><head><title>{self.name} - page {index}</title></head>
+<body>
+<nav><ul>{links}</ul></nav>
+<section class="about-us"><p>{self.name} has helped professionals, athletes and founders with their visas for
+over a decade. Our team prepares every application with the evidence reviewers expect to see.</p></section>
+<section class="testimonials">{testimonials}</section>
+<div class="team-member"><h3>{member} {self.name}</h3><span class="title">Senior Attorney</span>
+<p class="bio">{member} has filed {100 + index} successful petitions.</p></div>
+<div class="service-card"><h3>{service}</h3><p>End-to-end support for {service.lower()}.</p></div>
+<p>We have helped 500+ clients with a 98% success rate and {10 + index} years of experience.</p>
+</body></html>""".encode()
+
+
+def make_handler(site, latency):
+    """Request handler class serving one synthetic site after an artificial delay"""
+
+    class SiteHandler(BaseHTTPRequestHandler):
+        protocol_version = 'HTTP/1.1'
+
+        def do_GET(self):
+            time.sleep(latency)
+            index = site.index_of(self.path.split('?')[0])
+            if index is None:
+                self.send_response(404)
+                self.send_header('Content-Length', '0')
+                self.end_headers()
+                return
+
+            body = site.render(index)
+            self.send_response(200)
+            self.send_header('Content-Type', 'text/html; charset=utf-8')
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            pass
+
+    return SiteHandler
+
+
+@contextlib.contextmanager
+def serve_sites(count, pages, fan_out, testimonials, latency):
+    """Start one local server per synthetic brand and yield {brand_id: base_url}"""
+    servers = []
+    try:
+        for number in range(count):
+            site = SyntheticSite(f"Brand{number}", pages, fan_out, testimonials)
+            server = ThreadingHTTPServer(('127.0.0.1', 0), make_handler(site, latency))
+            server.daemon_threads = True
+            threading.Thread(target=server.serve_forever, daemon=True).start()
+            servers.append(server)
+        yield {f"brand-{number}": f"http://127.0.0.1:{server.server_port}/" for number, server in enumerate(servers)}
+    finally:
+        for server in servers:
+            server.shutdown()
+            server.server_close()
+
+
+def peak_memory_mb():
+    """Peak resident memory of this process in MB"""
+    import resource
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / (1024 * 1024) if sys.platform == 'darwin' else peak / 1024
+
+
+def run_mode(mode, sites, pages):
+    """Crawl the sites in one mode and return its measurements; runs in a fresh worker process"""
+    from crawl_websites import WebsiteCrawler, crawl_brands_parallel
+
+    options = {"max_pages": pages, "use_sitemaps": False}
+    wall_started = time.perf_counter()
+    cpu_started = time.process_time()
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        if mode == 'parallel':
+            results = asyncio.run(crawl_brands_parallel(sites, max_concurrency=12, **options))
+        else:
+            results = {}
+            for brand_id, url in sites.items():
+                crawler = WebsiteCrawler(url, **options)
+                results[brand_id] = asyncio.run(crawler.crawl_async()) if mode == 'async' else crawler.crawl()
+
+    return {
+        "mode": mode,
+        "pages": sum(len(content['all_pages']) for content in results.values()),
+        "testimonials": sum(len(content['testimonials']) for content in results.values()),
+        "seconds": time.perf_counter() - wall_started,
+        "cpu_seconds": time.process_time() - cpu_started,
+        "peak_mb": peak_memory_mb()
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark WebsiteCrawler against local synthetic brand sites")
+    parser.add_argument("--pages", type=int, default=30, help="Pages per synthetic site (and crawl page budget)")
+    parser.add_argument("--fan-out", type=int, default=8, help="Links from every page to other pages")
+    parser.add_argument("--testimonials", type=int, default=3, help="Testimonials per page")
+    parser.add_argument("--latency-ms", type=float, default=50, help="Artificial server latency per request")
+    parser.add_argument("--brands", type=int, default=3, help="Synthetic brand sites to crawl")
+    parser.add_argument("--modes", nargs="+", choices=MODES, default=list(MODES), help="Crawl modes to run")
+    parser.add_argument("--worker", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker:
+        mode, sites = args.worker.split(':', 1)
+        print(json.dumps(run_mode(mode, json.loads(sites), args.pages)))
+        return 0
+
+    print(f"{args.brands} sites x {args.pages} pages, fan-out {args.fan_out}, "
+          f"{args.testimonials} testimonials/page, {args.latency_ms:.0f} ms latency\n")
+    print(f"{'Mode':<10}{'Pages':>7}{'Seconds':>10}{'Pages/s':>10}{'CPU s':>8}{'Peak MB':>9}{'Testimonials':>14}")
+
+    with serve_sites(args.brands, args.pages, args.fan_out, args.testimonials, args.latency_ms / 1000) as sites:
+        for mode in args.modes:
+            # A fresh interpreter per mode keeps peak memory and CPU time from bleeding across modes
+            worker = subprocess.run(
+                [sys.executable, __file__, "--pages", str(args.pages), "--worker", f"{mode}:{json.dumps(sites)}"],
+                capture_output=True, text=True
+            )
+            if worker.returncode != 0:
+                print(f"{mode:<10} failed:\n{worker.stderr}")
+                return 1
+
+            result = json.loads(worker.stdout.strip().splitlines()[-1])
+            print(f"{mode:<10}{result['pages']:>7}{result['seconds']:>10.2f}"
+                  f"{result['pages'] / result['seconds']:>10.1f}{result['cpu_seconds']:>8.2f}"
+                  f"{result['peak_mb']:>9.1f}{result['testimonials']:>14}")
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
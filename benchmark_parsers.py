@@ -0,0 +1,117 @@
+"""
+Parser Backend Benchmark for the Website Crawler
+Parses a corpus of saved brand pages with each HTML parser backend, times parsing and extraction,
+and checks that every backend extracts exactly the same records as the html.parser reference.
+
+Usage:
+    python3 benchmark_parsers.py path/to/saved/pages [--repeat 3]
+    python3 benchmark_parsers.py --from-cache          # pages saved by `crawl_websites.py --cache`
+"""
+
+import argparse
+import glob
+import os
+import sys
+import time
+
+from bs4 import BeautifulSoup
+from bs4.builder import builder_registry
+
+from crawl_websites import PARSER_BACKENDS, PageExtractor, ResponseCache
+
+REFERENCE_PARSER = 'html.parser'
+
+
+def load_corpus(paths):
+    """Read every .html/.htm file under the given files or directories"""
+    files = []
+    for path in paths:
+        if os.path.isdir(path):
+            for pattern in ('**/*.html', '**/*.htm'):
+                files.extend(glob.glob(os.path.join(path, pattern), recursive=True))
+        else:
+            files.append(path)
+
+    corpus = {}
+    for file_path in sorted(set(files)):
+        with open(file_path, 'rb') as f:
+            corpus[file_path] = f.read()
+    return corpus
+
+
+def comparable(records):
+    """Drop the per-run timestamp so records from different runs compare equal"""
+    if isinstance(records, list):
+        return [{k: v for k, v in record.items() if k != 'extracted_date'} for record in records]
+    return records
+
+
+def run_backend(parser, corpus, extractor, repeat):
+    """Parse and extract the whole corpus, returning (parse seconds, extract seconds, records by file)"""
+    parse_seconds = 0.0
+    extract_seconds = 0.0
+    results = {}
+
+    for _ in range(repeat):
+        for file_path, html in corpus.items():
+            started = time.perf_counter()
+            soup = BeautifulSoup(html, parser)
+            parsed = time.perf_counter()
+            extracted = extractor.extract(soup, file_path)
+            finished = time.perf_counter()
+
+            parse_seconds += parsed - started
+            extract_seconds += finished - parsed
+            results[file_path] = {key: comparable(value) for key, value in extracted.items()}
+
+    return parse_seconds, extract_seconds, results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark HTML parser backends on saved brand pages")
+    parser.add_argument("paths", nargs="*", help="Saved .html files or directories containing them")
+    parser.add_argument("--from-cache", action="store_true",
+                        help="Also use every page in the crawler's on-disk response cache")
+    parser.add_argument("--repeat", type=int, default=3, help="Parse the corpus this many times per backend")
+    args = parser.parse_args()
+
+    corpus = load_corpus(args.paths)
+    if args.from_cache:
+        corpus.update(ResponseCache().iter_bodies())
+    if not corpus:
+        print("No .html files found")
+        return 1
+
+    total_bytes = sum(len(html) for html in corpus.values())
+    print(f"Corpus: {len(corpus)} pages, {total_bytes / 1024:.0f} KB, {args.repeat} repeats\n")
+
+    extractor = PageExtractor()
+    backends = [REFERENCE_PARSER] + [name for name in PARSER_BACKENDS if name != REFERENCE_PARSER]
+    reference = None
+    mismatches = 0
+
+    print(f"{'Backend':<14}{'Parse s':>10}{'Extract s':>11}{'Pages/s':>10}{'Speedup':>9}  Records")
+    for backend in backends:
+        if not builder_registry.lookup(backend):
+            print(f"{backend:<14}{'not installed':>30}")
+            continue
+
+        parse_seconds, extract_seconds, results = run_backend(backend, corpus, extractor, args.repeat)
+        total = parse_seconds + extract_seconds
+        if reference is None:
+            reference = (total, results)
+
+        differing = [path for path in corpus if results[path] != reference[1][path]]
+        mismatches += len(differing)
+        status = "identical" if not differing else f"{len(differing)} pages differ"
+        print(f"{backend:<14}{parse_seconds:>10.2f}{extract_seconds:>11.2f}"
+              f"{len(corpus) * args.repeat / total:>10.1f}{reference[0] / total:>8.1f}x  {status}")
+        for path in differing[:5]:
+            fields = [key for key in results[path] if results[path][key] != reference[1][path][key]]
+            print(f"    {path}: {', '.join(fields)}")
+
+    return 1 if mismatches else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,270 @@
+"""
+Config Loader for Landing Page Generator
+Loads config/brands.json and config/philosophy.json once, validates them into compact typed
+objects, and keeps those until the file changes on disk. Every access costs one stat() call, so
+edits show up on the next rerun without a server restart and without re-parsing JSON on the hot path.
+"""
+
+import json
+import os
+import re
+import threading
+
+CONFIG_DIR = "config"
+
+HEX_COLOR = re.compile(r'^#[0-9a-fA-F]{6}$')
+COLOR_ROLES = ('primary', 'secondary', 'accent')
+CTA_POSITIONS = ('top', 'middle', 'bottom')
+
+
+class ConfigError(ValueError):
+    """Raised when a config file parses as JSON but does not have the expected shape"""
+
+
+class ConfigFile:
+    """
+    A JSON file parsed (and optionally validated) once per change on disk.
+
+    The file's mtime, size and inode are compared on every get(); only a change triggers a
+    reload. A reload is published in one assignment after parsing and validation succeed, so
+    readers see either the old config or the new one, never a mix. If an edit leaves the file
+    broken, the last good config keeps being served and the problem is reported in error.
+    """
+
+    def __init__(self, path, parse=None):
+        self.path = path
+        self.parse = parse
+        self.version = 0
+        self.error = None
+        self._loaded = None  # (signature, value) of the last good load
+        self._failed_signature = None
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _signature(path):
+        stat = os.stat(path)
+        return stat.st_mtime_ns, stat.st_size, stat.st_ino
+
+    def get(self):
+        """The parsed file, reloading it only if it changed since the last call"""
+        signature = self._signature(self.path)
+        loaded = self._loaded
+        if loaded and loaded[0] == signature:
+            return loaded[1]
+        if loaded and signature == self._failed_signature:
+            return loaded[1]
+
+        with self._lock:
+            loaded = self._loaded
+            if loaded and loaded[0] == signature:
+                return loaded[1]
+            try:
+                with open(self.path, 'r', encoding='utf-8') as f:
+                    value = json.load(f)
+                if self.parse:
+                    value = self.parse(value)
+            except (json.JSONDecodeError, ConfigError) as e:
+                if not loaded:
+                    raise
+                # Keep serving the last good config until the file is fixed
+                self.error = f"{os.path.basename(self.path)}: {e}"
+                self._failed_signature = signature
+                return loaded[1]
+
+            self._loaded = (signature, value)
+            self._failed_signature = None
+            self.error = None
+            self.version += 1
+            return value
+
+
+def _require_string(errors, where, value):
+    if not isinstance(value, str) or not value.strip():
+        errors.append(f"{where} must be a non-empty string")
+
+
+def validate_brands(data):
+    """Check every brand has a name, logo, website, hex colors, CTAs and object-shaped options; returns the raw brands unchanged"""
+    if not isinstance(data, dict):
+        raise ConfigError("brands.json must map brand ids to brand objects")
+
+    errors = []
+    for brand_id, brand in data.items():
+        if not isinstance(brand, dict):
+            errors.append(f"{brand_id} must be an object")
+            continue
+        for field in ('name', 'logo', 'website'):
+            _require_string(errors, f"{brand_id}.{field}", brand.get(field))
+
+        colors = brand.get('colors')
+        if not isinstance(colors, dict):
+            errors.append(f"{brand_id}.colors must be an object")
+        else:
+            for role in COLOR_ROLES:
+                if not isinstance(colors.get(role), str) or not HEX_COLOR.match(colors[role]):
+                    errors.append(f"{brand_id}.colors.{role} must be a hex color like #1A1A1A")
+
+        ctas = brand.get('ctas')
+        if not isinstance(ctas, dict):
+            errors.append(f"{brand_id}.ctas must be an object")
+        else:
+            # Every CTA is compiled, so extra positions need the same shape as the required ones
+            extra_positions = tuple(position for position in ctas if position not in CTA_POSITIONS)
+            for position in CTA_POSITIONS + extra_positions:
+                cta = ctas.get(position)
+                if not isinstance(cta, dict):
+                    errors.append(f"{brand_id}.ctas.{position} must be an object with text and url")
+                    continue
+                _require_string(errors, f"{brand_id}.ctas.{position}.text", cta.get('text'))
+                _require_string(errors, f"{brand_id}.ctas.{position}.url", cta.get('url'))
+
+        for field in ('live_chat', 'lead_form'):
+            if brand.get(field) and not isinstance(brand[field], dict):
+                errors.append(f"{brand_id}.{field} must be an object")
+
+    if errors:
+        raise ConfigError("; ".join(errors))
+    return data
+
+
+def validate_philosophy(data):
+    """Check every philosophy has a name and a list of sections; returns the philosophies unchanged"""
+    if not isinstance(data, dict):
+        raise ConfigError("philosophy.json must map philosophy ids to philosophy objects")
+
+    errors = []
+    for philosophy_id, philosophy in data.items():
+        if not isinstance(philosophy, dict):
+            errors.append(f"{philosophy_id} must be an object")
+            continue
+        _require_string(errors, f"{philosophy_id}.name", philosophy.get('name'))
+        if not isinstance(philosophy.get('sections'), list):
+            errors.append(f"{philosophy_id}.sections must be a list")
+
+    if errors:
+        raise ConfigError("; ".join(errors))
+    return data
+
+
+def get_contrast_text_color(hex_color):
+    """Return black or white text color based on background luminance"""
+    try:
+        # Remove # if present
+        hex_color = hex_color.lstrip('#')
+        # Convert to RGB
+        r, g, b = int(hex_color[0:2], 16), int(hex_color[2:4], 16), int(hex_color[4:6], 16)
+        # Calculate relative luminance
+        luminance = (0.299 * r + 0.587 * g + 0.114 * b) / 255
+        # Return black for light backgrounds, white for dark
+        return '#000000' if luminance > 0.5 else '#FFFFFF'
+    except (ValueError, IndexError):
+        return '#FFFFFF'  # Default to white if error
+
+
+def to_prompt_json(value):
+    """Serialize config data the way the generation prompts embed it"""
+    return json.dumps(value, indent=2)
+
+
+class BrandColors:
+    """A brand's palette with the readable text color for each background precomputed"""
+
+    __slots__ = ('primary', 'secondary', 'accent', 'primary_text', 'secondary_text', 'accent_text', '_mapping')
+
+    def __init__(self, primary, secondary, accent):
+        self.primary = primary
+        self.secondary = secondary
+        self.accent = accent
+        self.primary_text = get_contrast_text_color(primary)
+        self.secondary_text = get_contrast_text_color(secondary)
+        self.accent_text = get_contrast_text_color(accent)
+        self._mapping = {'primary': primary, 'secondary': secondary, 'accent': accent}
+
+    def as_dict(self):
+        """The palette in the same shape as the user's custom colors"""
+        return self._mapping
+
+
+class Cta:
+    __slots__ = ('text', 'url')
+
+    def __init__(self, text, url):
+        self.text = text
+        self.url = url
+
+
+class Brand:
+    """
+    A validated brands.json entry. Optional sections are None when absent, and the JSON the
+    generation prompt embeds for them is serialized once here instead of on every generation.
+    """
+
+    __slots__ = ('id', 'name', 'logo', 'website', 'founder', 'tagline', 'colors', 'ctas',
+                 'credentials', 'trust_badges', 'live_chat', 'lead_form',
+                 'credentials_json', 'trust_badges_json', 'live_chat_json', 'lead_form_json',
+                 'live_chat_enabled', 'multi_step_form')
+
+    def __init__(self, brand_id, data):
+        self.id = brand_id
+        self.name = data['name']
+        self.logo = data['logo']
+        self.website = data['website']
+        self.founder = data.get('founder')
+        self.tagline = data.get('tagline')
+        self.colors = BrandColors(*(data['colors'][role] for role in COLOR_ROLES))
+        self.ctas = {position: Cta(cta['text'], cta['url']) for position, cta in data['ctas'].items()}
+        self.credentials = data.get('credentials')
+        self.trust_badges = data.get('trust_badges')
+        self.live_chat = data.get('live_chat') or {}
+        self.lead_form = data.get('lead_form') or {}
+
+        self.credentials_json = to_prompt_json(self.credentials) if 'credentials' in data else None
+        self.trust_badges_json = to_prompt_json(self.trust_badges) if 'trust_badges' in data else None
+        self.live_chat_enabled = bool(self.live_chat.get('enabled'))
+        self.live_chat_json = to_prompt_json(self.live_chat) if self.live_chat_enabled else None
+        self.multi_step_form = self.lead_form.get('type') == 'multi-step'
+        self.lead_form_json = to_prompt_json(self.lead_form) if self.multi_step_form else None
+
+
+class Philosophy:
+    """A validated philosophy.json entry with its prompt JSON serialized once"""
+
+    __slots__ = ('id', 'name', 'sections', 'prompt_json')
+
+    def __init__(self, philosophy_id, data):
+        self.id = philosophy_id
+        self.name = data['name']
+        self.sections = data['sections']
+        self.prompt_json = to_prompt_json(data)
+
+
+def compile_brands(data):
+    """Validate brands.json and build a Brand per entry"""
+    return {brand_id: Brand(brand_id, brand) for brand_id, brand in validate_brands(data).items()}
+
+
+def compile_philosophy(data):
+    """Validate philosophy.json and build a Philosophy per entry"""
+    return {
+        philosophy_id: Philosophy(philosophy_id, philosophy)
+        for philosophy_id, philosophy in validate_philosophy(data).items()
+    }
+
+
+class ConfigLoader:
+    """The app's brand and philosophy configs, hot-reloaded from disk"""
+
+    def __init__(self, directory=CONFIG_DIR):
+        self.brands_file = ConfigFile(os.path.join(directory, 'brands.json'), compile_brands)
+        self.philosophy_file = ConfigFile(os.path.join(directory, 'philosophy.json'), compile_philosophy)
+
+    def brands(self):
+        return self.brands_file.get()
+
+    def philosophy(self):
+        return self.philosophy_file.get()
+
+    @property
+    def errors(self):
+        """Problems with edits that were rejected while an older config is still being served"""
+        return [f.error for f in (self.brands_file, self.philosophy_file) if f.error]
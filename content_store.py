@@ -0,0 +1,161 @@
+"""
+Verified Content Store
+Keeps crawled and curated verified content as one JSON shard per brand
+(config/verified_content/<brand-id>.json), so the app reads only the brand it is
+generating for and the crawler can replace one brand without rewriting the rest.
+
+Usage:
+    python3 content_store.py --split config/verified_content.json   # migrate a single-file store
+"""
+
+import argparse
+import json
+import os
+import threading
+
+from config_loader import ConfigError, ConfigFile, to_prompt_json
+
+VERIFIED_CONTENT_DIR = "config/verified_content"
+LEGACY_VERIFIED_CONTENT_FILE = "config/verified_content.json"
+
+
+# Services beyond this many are left out of the generation prompt
+PROMPT_SERVICE_LIMIT = 5
+
+LIST_FIELDS = ('testimonials', 'video_testimonials', 'case_studies', 'team_members', 'services',
+               'achievements', 'press_mentions', 'faqs')
+DICT_FIELDS = ('pricing', 'eligibility_quiz')
+
+
+class VerifiedContent:
+    """
+    One brand's validated verified content. The JSON blocks the generation prompt embeds are
+    serialized once per shard load; each is None when the brand has nothing for that section.
+    """
+
+    __slots__ = LIST_FIELDS + DICT_FIELDS + (
+        'about_text', 'allow_ai_testimonials', 'crawl_date',
+        'testimonials_json', 'video_testimonials_json', 'achievements_json', 'services_json',
+        'press_mentions_json', 'faqs_json', 'pricing_json', 'eligibility_quiz_json'
+    )
+
+    def __init__(self, data=None):
+        data = data or {}
+        if not isinstance(data, dict):
+            raise ConfigError("verified content must be an object")
+        for field in LIST_FIELDS:
+            value = data.get(field) or []
+            if not isinstance(value, list):
+                raise ConfigError(f"{field} must be a list")
+            setattr(self, field, value)
+        for field in DICT_FIELDS:
+            value = data.get(field) or {}
+            if not isinstance(value, dict):
+                raise ConfigError(f"{field} must be an object")
+            setattr(self, field, value)
+        self.about_text = data.get('about_text', "")
+        self.allow_ai_testimonials = bool(data.get('allow_ai_testimonials', False))
+        self.crawl_date = data.get('crawl_date')
+
+        self.testimonials_json = to_prompt_json(self.testimonials) if self.testimonials else None
+        self.video_testimonials_json = to_prompt_json(self.video_testimonials) if self.video_testimonials else None
+        self.achievements_json = to_prompt_json(self.achievements) if self.achievements else None
+        self.services_json = to_prompt_json(self.services[:PROMPT_SERVICE_LIMIT]) if self.services else None
+        self.press_mentions_json = to_prompt_json(self.press_mentions) if self.press_mentions else None
+        self.faqs_json = to_prompt_json(self.faqs) if self.faqs else None
+        self.pricing_json = to_prompt_json(self.pricing) if self.pricing else None
+        self.eligibility_quiz_json = (to_prompt_json(self.eligibility_quiz)
+                                      if self.eligibility_quiz.get('enabled') else None)
+
+    def __bool__(self):
+        return any(getattr(self, field) for field in LIST_FIELDS + DICT_FIELDS) or bool(self.about_text)
+
+
+EMPTY_CONTENT = VerifiedContent()
+
+
+class VerifiedContentStore:
+    """
+    Reads and writes per-brand verified content shards.
+
+    Each shard is a ConfigFile that compiles to a VerifiedContent, so every read costs one
+    stat() call and the shard is only parsed again after the crawler (or an editor) replaces it.
+    Shards are written to a temporary file and renamed into place, so readers never see half a
+    file.
+    """
+
+    def __init__(self, directory=VERIFIED_CONTENT_DIR, legacy_file=LEGACY_VERIFIED_CONTENT_FILE):
+        self.directory = directory
+        self.legacy_file = legacy_file
+        self._files = {}
+        self._lock = threading.Lock()
+
+    def path(self, brand_id):
+        if not brand_id or os.path.basename(brand_id) != brand_id or brand_id.startswith('.'):
+            raise ValueError(f"invalid brand id: {brand_id!r}")
+        return os.path.join(self.directory, f"{brand_id}.json")
+
+    def _file(self, key, path, parse=None):
+        with self._lock:
+            if key not in self._files:
+                self._files[key] = ConfigFile(path, parse)
+            return self._files[key]
+
+    def _read(self, key, path, parse=None):
+        """The parsed file, or None if it does not exist"""
+        try:
+            return self._file(key, path, parse).get()
+        except FileNotFoundError:
+            return None
+
+    def get(self, brand_id):
+        """Verified content for one brand, empty when nothing has been crawled or curated for it"""
+        content = self._read(brand_id, self.path(brand_id), VerifiedContent)
+        if content is None and self.legacy_file:
+            # Stores that predate sharding keep every brand in one file
+            content = self._read(('legacy', brand_id), self.legacy_file,
+                                 lambda data: VerifiedContent(data.get(brand_id)))
+        return content or EMPTY_CONTENT
+
+    @property
+    def errors(self):
+        """Problems with shard edits that were rejected while an older copy is still being served"""
+        return [f.error for f in list(self._files.values()) if f.error]
+
+    def brand_ids(self):
+        """Brands that have a shard"""
+        if not os.path.isdir(self.directory):
+            return []
+        return sorted(name[:-len('.json')] for name in os.listdir(self.directory) if name.endswith('.json'))
+
+    def put(self, brand_id, content):
+        """Atomically replace a brand's shard"""
+        os.makedirs(self.directory, exist_ok=True)
+        path = self.path(brand_id)
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(content, f, indent=2, ensure_ascii=False)
+        os.replace(tmp_path, path)
+
+    def split(self, source):
+        """Write one shard per brand from a single-file store; returns the brand ids written"""
+        with open(source, 'r', encoding='utf-8') as f:
+            all_content = json.load(f)
+        for brand_id, content in all_content.items():
+            self.put(brand_id, content)
+        return list(all_content)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Manage the per-brand verified content shards")
+    parser.add_argument("--split", metavar="FILE", help="Write one shard per brand from a single-file store")
+    parser.add_argument("--directory", default=VERIFIED_CONTENT_DIR, help="Shard directory")
+    args = parser.parse_args()
+
+    store = VerifiedContentStore(args.directory)
+    if args.split:
+        for brand_id in store.split(args.split):
+            print(f"✅ {brand_id} -> {store.path(brand_id)}")
+    else:
+        for brand_id in store.brand_ids():
+            print(f"{brand_id}: {os.path.getsize(store.path(brand_id)) / 1024:.1f} KB")
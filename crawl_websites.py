@@ -4,18 +4,1034 @@ Crawls brand websites to extract verified content including testimonials, case s
 """
 
 import requests
-from bs4 import BeautifulSoup
-from urllib.parse import urljoin, urlparse
+from requests.adapters import HTTPAdapter
+from requests.structures import CaseInsensitiveDict
+from urllib3.util.retry import Retry
+from bs4 import BeautifulSoup, CData, NavigableString, Tag
+from bs4.builder import builder_registry
+from urllib.parse import urljoin, urlparse, urlsplit, urlunsplit, parse_qsl, urlencode
+from urllib.robotparser import RobotFileParser
+from xml.etree import ElementTree
+import argparse
+import asyncio
+from bisect import bisect_left
+import gzip
+import hashlib
 import json
+import math
+import os
+import random
+import sqlite3
+import threading
 import time
-from datetime import datetime
+import zlib
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import asynccontextmanager, closing
+from datetime import datetime, timezone
 import re
 
+from content_store import VerifiedContentStore
+
+
+class HostRateLimiter:
+    """Caps in-flight requests per host (and optionally overall) and spaces out request starts to stay polite"""
+
+    def __init__(self, max_per_host=6, min_interval=0.1, max_total=None):
+        self.max_per_host = max_per_host
+        self.min_interval = min_interval
+        self.max_total = max_total
+        self._semaphores = {}
+        self._next_start = {}
+        self._host_intervals = {}
+        self._total = None
+
+    def set_min_interval(self, host, seconds):
+        """Space one host's requests further apart, e.g. to honor its robots.txt Crawl-delay"""
+        self._host_intervals[host] = max(seconds, self.min_interval)
+
+    @asynccontextmanager
+    async def slot(self, url):
+        """Hold one of the host's request slots for the duration of a fetch"""
+        host = urlparse(url).netloc
+        if host not in self._semaphores:
+            self._semaphores[host] = asyncio.Semaphore(self.max_per_host)
+
+        if self.max_total and self._total is None:
+            self._total = asyncio.Semaphore(self.max_total)
+
+        async with self._semaphores[host]:
+            # Wait out the host's spacing first so a slow host never holds a global slot while idle
+            await self._wait_turn(host)
+            if self._total is None:
+                yield
+                return
+            async with self._total:
+                yield
+
+    async def _wait_turn(self, host):
+        """Sleep until at least min_interval has passed since the host's previous request start"""
+        now = asyncio.get_running_loop().time()
+        start = max(now, self._next_start.get(host, now))
+        self._next_start[host] = start + self._host_intervals.get(host, self.min_interval)
+        if start > now:
+            await asyncio.sleep(start - now)
+
+
+# Query parameters that only track campaigns and never change page content
+TRACKING_PARAMS = {'gclid', 'fbclid', 'msclkid', 'dclid', 'yclid', 'mc_cid', 'mc_eid', '_ga', '_gl', 'ref', 'hsa_acc'}
+TRACKING_PARAM_PREFIXES = ('utm_', 'hsa_', 'pk_')
+
+# Linked files that are never HTML pages and would only waste the page budget
+NON_HTML_EXTENSIONS = {
+    '.pdf', '.jpg', '.jpeg', '.png', '.gif', '.svg', '.webp', '.ico', '.bmp', '.tif', '.tiff',
+    '.zip', '.rar', '.gz', '.tar', '.7z', '.dmg', '.exe',
+    '.mp3', '.mp4', '.m4a', '.mov', '.avi', '.wmv', '.webm', '.wav',
+    '.doc', '.docx', '.xls', '.xlsx', '.ppt', '.pptx', '.csv',
+    '.css', '.js', '.json', '.xml', '.rss', '.woff', '.woff2', '.ttf', '.eot',
+}
+
+DEFAULT_PORTS = {'http': 80, 'https': 443}
+
+
+def canonicalize_url(url, scheme=None, strip_trailing_slash=True):
+    """
+    Normalize a URL so trivially different links to the same page compare equal.
+
+    Drops the fragment, user info and tracking query params, lowercases scheme and host,
+    removes default ports, sorts the remaining query params and (optionally) the trailing
+    slash. Passing scheme maps http/https twins onto the site's own scheme.
+    """
+    parts = urlsplit(url.strip())
+    url_scheme = parts.scheme.lower()
+    host = (parts.hostname or '').lower()
+    if ':' in host:
+        host = f"[{host}]"  # IPv6 literal
+    try:
+        port = parts.port
+    except ValueError:
+        port = None
+    netloc = host if port in (None, DEFAULT_PORTS.get(url_scheme)) else f"{host}:{port}"
+
+    if scheme and url_scheme in DEFAULT_PORTS:
+        url_scheme = scheme
+
+    path = parts.path or '/'
+    if strip_trailing_slash and len(path) > 1:
+        path = path.rstrip('/') or '/'
+
+    query = urlencode(sorted(
+        (key, value) for key, value in parse_qsl(parts.query, keep_blank_values=True)
+        if key.lower() not in TRACKING_PARAMS and not key.lower().startswith(TRACKING_PARAM_PREFIXES)
+    ))
+
+    return urlunsplit((url_scheme, netloc, path, query, ''))
+
+
+def is_crawlable_url(url):
+    """Check that a URL is an http(s) link that can plausibly return an HTML page"""
+    parts = urlsplit(url)
+    if parts.scheme not in DEFAULT_PORTS:
+        return False
+    return os.path.splitext(parts.path)[1].lower() not in NON_HTML_EXTENSIONS
+
+
+# Content types worth parsing; anything else is aborted before its body is downloaded
+HTML_CONTENT_TYPES = {'text/html', 'application/xhtml+xml'}
+
+# Advertise brotli only when urllib3 can decode it
+try:
+    import brotli  # noqa: F401
+    ACCEPT_ENCODING = 'gzip, deflate, br'
+except ImportError:
+    try:
+        import brotlicffi  # noqa: F401
+        ACCEPT_ENCODING = 'gzip, deflate, br'
+    except ImportError:
+        ACCEPT_ENCODING = 'gzip, deflate'
+
+
+# Transient statuses worth retrying; urllib3 honours Retry-After on 429 and 503
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+
+
+def create_session(pool_size=10, retries=3, backoff_factor=0.5, backoff_jitter=0.5, max_hosts=10):
+    """
+    A requests session with a keep-alive connection pool per host (up to max_hosts hosts,
+    pool_size connections each) that retries connection errors and transient statuses
+    with jittered exponential backoff
+    """
+    retry = Retry(
+        total=retries,
+        backoff_factor=backoff_factor,
+        backoff_jitter=backoff_jitter,
+        backoff_max=30,
+        status_forcelist=RETRY_STATUSES,
+        allowed_methods={'GET', 'HEAD'},
+        respect_retry_after_header=True,
+        raise_on_status=False
+    )
+    adapter = HTTPAdapter(pool_connections=max_hosts, pool_maxsize=pool_size, max_retries=retry)
+    session = requests.Session()
+    session.mount('https://', adapter)
+    session.mount('http://', adapter)
+    return session
+
+
+# Local working files (validators, caches, checkpoints) that never get committed
+CRAWL_CACHE_DIR = ".crawl_cache"
+
+
+# Path keywords of the pages that feed verified_content.json, highest priority first
+PRIORITY_PATH_KEYWORDS = [
+    (3, ('testimonial', 'review', 'success-stor', 'case-stud', 'results')),
+    (2, ('about', 'team', 'attorney', 'lawyer', 'staff', 'our-people')),
+    (1, ('service', 'practice-area', 'what-we-do', 'pricing')),
+]
+
+
+def score_url(url):
+    """Score a URL by how likely its page holds testimonials, team or service content"""
+    path = urlparse(url).path.lower()
+    for score, keywords in PRIORITY_PATH_KEYWORDS:
+        if any(keyword in path for keyword in keywords):
+            return score
+    return 0
+
+
+class CrawlFrontier:
+    """Crawl queue with O(1) push/pop, a set of every URL ever enqueued and optional priority tiers"""
+
+    def __init__(self, scorer=None, key=None):
+        self.scorer = scorer
+        self.key = key
+        self.enqueued = set()
+        self._tiers = {}
+        self._size = 0
+
+    def add(self, url):
+        """Enqueue a URL unless it (or a URL with the same key) was enqueued before; returns whether it was added"""
+        url_key = self.key(url) if self.key else url
+        if url_key in self.enqueued:
+            return False
+        self.enqueued.add(url_key)
+        self._push(url)
+        return True
+
+    def _push(self, url):
+        priority = self.scorer(url) if self.scorer else 0
+        self._tiers.setdefault(priority, deque()).append(url)
+        self._size += 1
+
+    def pop(self):
+        """Return the oldest URL from the highest non-empty priority tier"""
+        for priority in sorted(self._tiers, reverse=True):
+            tier = self._tiers[priority]
+            if tier:
+                self._size -= 1
+                return tier.popleft()
+        raise IndexError("pop from an empty frontier")
+
+    def __len__(self):
+        return self._size
+
+    def to_dict(self, pending=()):
+        """Serialize the queue in pop order, plus URLs that were popped but never finished (e.g. in flight)"""
+        queued = [url for priority in sorted(self._tiers, reverse=True) for url in self._tiers[priority]]
+        return {"pending": list(pending) + queued, "enqueued": sorted(self.enqueued)}
+
+    def restore(self, data):
+        """Load a queue saved by to_dict into this (empty) frontier"""
+        self.enqueued = set(data['enqueued'])
+        for url in data['pending']:
+            self._push(url)
+
+
+# Discovery limits so a huge or looping sitemap index can't stall a crawl
+MAX_SITEMAPS = 25
+MAX_SITEMAP_URLS = 5000
+
+_robots_cache = {}
+_robots_lock = threading.Lock()
+
+
+def fetch_robots(origin, headers, session=None):
+    """Fetch and parse a host's robots.txt once per process; a missing or unreachable file allows everything"""
+    with _robots_lock:
+        if origin in _robots_cache:
+            return _robots_cache[origin]
+
+    robots = RobotFileParser(f"{origin}/robots.txt")
+    try:
+        response = (session or requests).get(robots.url, headers=headers, timeout=10)
+        if response.status_code in (401, 403):
+            robots.disallow_all = True
+        elif response.ok:
+            robots.parse(response.text.splitlines())
+        else:
+            robots.allow_all = True
+    except requests.RequestException:
+        robots.allow_all = True
+
+    with _robots_lock:
+        return _robots_cache.setdefault(origin, robots)
+
+
+def parse_lastmod(value):
+    """Parse a sitemap <lastmod> (W3C datetime or plain date) into an aware datetime, or None"""
+    try:
+        parsed = datetime.fromisoformat(value.strip().replace('Z', '+00:00'))
+    except ValueError:
+        return None
+    return parsed if parsed.tzinfo else parsed.replace(tzinfo=timezone.utc)
+
+
+def iter_sitemap(response):
+    """
+    Stream (kind, loc, lastmod) entries from a sitemap or sitemap index response, where kind is
+    'url' or 'sitemap', parsing incrementally and clearing each entry so memory stays flat
+    """
+    source = response.raw
+    source.decode_content = True
+    if urlsplit(response.url).path.endswith('.gz') and 'gzip' not in response.headers.get('Content-Encoding', ''):
+        source = gzip.GzipFile(fileobj=source)
+
+    loc = lastmod = None
+    path = []  # (namespace, tag) of the open elements
+    for event, elem in ElementTree.iterparse(source, events=('start', 'end')):
+        namespace, _, tag = elem.tag.rpartition('}')
+        if event == 'start':
+            path.append((namespace, tag))
+            continue
+        path.pop()
+        parent = path[-1] if path else None
+
+        # Only the entry's own <loc>, not an extension's such as <image:loc> inside the same <url>
+        if tag in ('loc', 'lastmod') and parent in ((namespace, 'url'), (namespace, 'sitemap')):
+            if tag == 'loc':
+                loc = (elem.text or '').strip()
+            else:
+                lastmod = (elem.text or '').strip()
+        elif tag in ('url', 'sitemap') and parent in ((namespace, 'urlset'), (namespace, 'sitemapindex')):
+            if loc:
+                yield tag, loc, lastmod
+            loc = lastmod = None
+            elem.clear()
+
+
+# HTML parser backends, fastest first; the pure-Python html.parser is always available as the fallback
+PARSER_BACKENDS = ['lxml', 'html.parser']
+
+
+def resolve_parser(parser='auto'):
+    """Return the BeautifulSoup backend to use: the fastest installed one for 'auto', else the named one if installed"""
+    if parser == 'auto':
+        return next(name for name in PARSER_BACKENDS if builder_registry.lookup(name))
+    if builder_registry.lookup(parser):
+        return parser
+    print(f"Parser backend {parser!r} is not installed, falling back to html.parser")
+    return 'html.parser'
+
+
+# Selector tables for each content type; PageExtractor compiles them once and matches them all in one tree walk
+TESTIMONIAL_SELECTORS = [
+    'div.testimonial',
+    'div[class*="testimonial"]',
+    'div[class*="review"]',
+    'div[class*="quote"]',
+    'blockquote',
+    'div[class*="client-feedback"]',
+    'div[class*="customer-review"]',
+]
+TESTIMONIAL_AUTHOR_SELECTORS = [
+    'cite', 'span.author', 'p.author',
+    'div.name', 'span.name', 'p.name',
+    'div[class*="author"]', 'span[class*="author"]'
+]
+TEAM_SELECTORS = [
+    'div[class*="team"]',
+    'div[class*="staff"]',
+    'div[class*="member"]',
+    'div[class*="attorney"]',
+    'div[class*="lawyer"]',
+    'div[class*="expert"]',
+]
+TEAM_NAME_SELECTOR = 'h3, h4, h5, strong, .name, [class*="name"]'
+TEAM_TITLE_SELECTOR = '.title, [class*="title"], [class*="position"]'
+TEAM_BIO_SELECTOR = 'p, .bio, [class*="bio"]'
+SERVICE_SELECTORS = [
+    'div[class*="service"]',
+    'div[class*="feature"]',
+    'div[class*="offering"]',
+    'li[class*="service"]',
+]
+SERVICE_TITLE_SELECTOR = 'h2, h3, h4, strong'
+SERVICE_DESCRIPTION_SELECTOR = 'p'
+ABOUT_SELECTORS = [
+    'div[class*="about"]',
+    'div[class*="mission"]',
+    'div[class*="story"]',
+    'section[class*="about"]',
+]
+
+# Patterns like "500+ clients", "95% success rate", "$10M raised", compiled into one alternation
+# A number with optional thousands separators; "2019, clients" is a year and a clause, not a count
+ACHIEVEMENT_NUMBER = r'(?<![\d,])(?:\d{1,3}(?:,\d{3})+|\d+)'
+ACHIEVEMENT_PATTERNS = [
+    ACHIEVEMENT_NUMBER + r'\s*[\+%]?\s+(?:clients|customers|cases|applications|visas|approvals|years|success)',
+    ACHIEVEMENT_NUMBER + r'\s*%\s+(?:success|approval|satisfaction|rate)',
+    r'\$' + ACHIEVEMENT_NUMBER + r'[MKB]?\s+(?:raised|funded|saved)',
+]
+ACHIEVEMENT_PATTERN = re.compile('|'.join(f'(?:{pattern})' for pattern in ACHIEVEMENT_PATTERNS), re.IGNORECASE)
+
+
+def normalize_achievement(text):
+    """Collapse whitespace, including between a number and its +/% sign ("500 +" -> "500+")"""
+    return re.sub(r'(?<=\d)\s+(?=[+%])', '', ' '.join(text.split()))
+
+
+def achievement_key(description):
+    """Dedup key under which case and thousands-separator variants of a metric collapse together"""
+    return re.sub(r'(?<=\d),(?=\d{3})', '', description.lower())
+
+_SIMPLE_SELECTOR = re.compile(r'^([a-z][a-z0-9]*)?(?:\.([\w-]+)|\[class\*="([^"]+)"\])?$')
+
+
+def compile_selector(selector):
+    """
+    Compile a selector group made of `tag`, `tag.class`, `.class` and `tag[class*="text"]`
+    parts into (tag, class_token, class_substring) tuples that can be matched without soupsieve
+    """
+    parts = []
+    for part in selector.split(','):
+        match = _SIMPLE_SELECTOR.match(part.strip())
+        if not match or not any(match.groups()):
+            raise ValueError(f"Unsupported selector for single-pass extraction: {part.strip()!r}")
+        parts.append(match.groups())
+    return parts
+
+
+class PageExtractor:
+    """
+    Extracts testimonials, team members, services, achievements and about text in a single walk
+    over the parsed tree, instead of one soup.select() pass per selector.
+
+    Every tag is classified once against all compiled selectors. Nested lookups such as a
+    testimonial's author become a binary search for the first matching tag inside the
+    element's pre-order index range, which is exactly what select_one() returns.
+    """
+
+    def __init__(self):
+        self.testimonial_rules = [compile_selector(s) for s in TESTIMONIAL_SELECTORS]
+        self.team_rules = [compile_selector(s) for s in TEAM_SELECTORS]
+        self.service_rules = [compile_selector(s) for s in SERVICE_SELECTORS]
+        self.about_rules = [compile_selector(s) for s in ABOUT_SELECTORS]
+        self.author_rules = [compile_selector(s) for s in TESTIMONIAL_AUTHOR_SELECTORS]
+        self.lookup_rules = {
+            "team_name": compile_selector(TEAM_NAME_SELECTOR),
+            "team_title": compile_selector(TEAM_TITLE_SELECTOR),
+            "team_bio": compile_selector(TEAM_BIO_SELECTOR),
+            "service_title": compile_selector(SERVICE_TITLE_SELECTOR),
+            "service_description": compile_selector(SERVICE_DESCRIPTION_SELECTOR),
+        }
+
+        # Every rule gets a slot; a tag's classification is the list of slots it matches
+        self._slots = []
+        self._testimonial_slots = [self._add_slot(rule) for rule in self.testimonial_rules]
+        self._team_slots = [self._add_slot(rule) for rule in self.team_rules]
+        self._service_slots = [self._add_slot(rule) for rule in self.service_rules]
+        self._about_slots = [self._add_slot(rule) for rule in self.about_rules]
+        self._author_slots = [self._add_slot(rule) for rule in self.author_rules]
+        self._lookup_slots = {name: self._add_slot(rule) for name, rule in self.lookup_rules.items()}
+
+        # Index the selector parts by tag name so each tag only checks parts that could apply
+        self._parts_by_tag = {}
+        self._parts_any_tag = []
+        for slot, parts in enumerate(self._slots):
+            for tag, class_token, class_substring in parts:
+                entry = (slot, class_token, class_substring)
+                if tag:
+                    self._parts_by_tag.setdefault(tag, []).append(entry)
+                else:
+                    self._parts_any_tag.append(entry)
+
+    def _add_slot(self, rule):
+        self._slots.append(rule)
+        return len(self._slots) - 1
+
+    def _matching_slots(self, tag):
+        """Return the set of rule slots a tag matches"""
+        classes = tag.get('class') or []
+        if isinstance(classes, str):
+            classes = classes.split()
+        class_string = ' '.join(classes)
+
+        slots = set()
+        for entries in (self._parts_by_tag.get(tag.name, ()), self._parts_any_tag):
+            for slot, class_token, class_substring in entries:
+                if class_token is not None:
+                    if class_token in classes:
+                        slots.add(slot)
+                elif class_substring is not None:
+                    if class_substring in class_string:
+                        slots.add(slot)
+                else:
+                    slots.add(slot)
+        return slots
+
+    def _walk(self, soup):
+        """
+        Walk the tree once, returning pre-order tags, each tag's subtree end index, the
+        sorted tag indices matched by every slot, and the document text (as soup.get_text())
+        """
+        text_types = getattr(soup, 'interesting_string_types', None) or (NavigableString, CData)
+        text_types = frozenset([text_types] if isinstance(text_types, type) else text_types)
+        tags = []
+        subtree_end = []
+        matches = [[] for _ in self._slots]
+        text_parts = []
+
+        stack = [(iter(soup.contents), None)]
+        while stack:
+            children, owner = stack[-1]
+            child = next(children, None)
+            if child is None:
+                stack.pop()
+                if owner is not None:
+                    subtree_end[owner] = len(tags)
+                continue
+
+            if isinstance(child, Tag):
+                index = len(tags)
+                tags.append(child)
+                subtree_end.append(index + 1)
+                for slot in self._matching_slots(child):
+                    matches[slot].append(index)
+                stack.append((iter(child.contents), index))
+            elif type(child) in text_types:
+                text_parts.append(child)
+
+        return tags, subtree_end, matches, ''.join(text_parts)
+
+    @staticmethod
+    def _first_within(indices, start, end):
+        """First index in the sorted list that falls inside [start, end), or None"""
+        position = bisect_left(indices, start)
+        if position < len(indices) and indices[position] < end:
+            return indices[position]
+        return None
+
+    def extract(self, soup, url, timings=None):
+        """Extract every content type from a parsed page, adding seconds per stage to timings if given"""
+        clock = time.perf_counter()
+
+        def lap(stage):
+            nonlocal clock
+            if timings is not None:
+                now = time.perf_counter()
+                timings[stage] = timings.get(stage, 0.0) + now - clock
+                clock = now
+
+        tags, subtree_end, matches, text = self._walk(soup)
+        lap('walk')
+        extracted_date = datetime.now().isoformat()
+        text_cache = {}
+
+        def text_of(index):
+            if index not in text_cache:
+                text_cache[index] = tags[index].get_text(strip=True)
+            return text_cache[index]
+
+        def first_descendant(slot, index):
+            return self._first_within(matches[slot], index + 1, subtree_end[index])
+
+        testimonials = []
+        for slot in self._testimonial_slots:
+            for index in matches[slot]:
+                quote = text_of(index)
+                if len(quote) > 50 and len(quote) < 1000:  # Reasonable testimonial length
+                    # Try to extract author name
+                    author = ""
+                    for author_slot in self._author_slots:
+                        author_index = first_descendant(author_slot, index)
+                        if author_index is not None:
+                            author = text_of(author_index)
+                            break
+
+                    testimonials.append({
+                        "quote": quote,
+                        "author": author if author else "Anonymous",
+                        "source_url": url,
+                        "verified": True,
+                        "extracted_date": extracted_date
+                    })
+        lap('testimonials')
+
+        team = []
+        for slot in self._team_slots:
+            for index in matches[slot]:
+                name_index = first_descendant(self._lookup_slots["team_name"], index)
+                if name_index is not None:
+                    title_index = first_descendant(self._lookup_slots["team_title"], index)
+                    bio_index = first_descendant(self._lookup_slots["team_bio"], index)
+                    team.append({
+                        "name": text_of(name_index),
+                        "title": text_of(title_index) if title_index is not None else "",
+                        "bio": text_of(bio_index) if bio_index is not None else "",
+                        "source_url": url
+                    })
+        lap('team_members')
+
+        services = []
+        for slot in self._service_slots:
+            for index in matches[slot]:
+                title_index = first_descendant(self._lookup_slots["service_title"], index)
+                if title_index is not None:
+                    description_index = first_descendant(self._lookup_slots["service_description"], index)
+                    services.append({
+                        "title": text_of(title_index),
+                        "description": text_of(description_index) if description_index is not None else "",
+                        "source_url": url
+                    })
+        lap('services')
+
+        about_text = ""
+        for slot in self._about_slots:
+            if matches[slot]:
+                candidate = text_of(matches[slot][0])
+                if len(candidate) > 100:
+                    about_text = candidate[:1000]  # Limit length
+                    break
+        lap('about_text')
+
+        achievements = self.extract_achievements(text, url)
+        lap('achievements')
+
+        return {
+            "testimonials": testimonials,
+            "team_members": team,
+            "services": services,
+            "achievements": achievements,
+            "about_text": about_text
+        }
+
+    def extract_achievements(self, text, url):
+        """Extract achievements, metrics, or success stories from page text"""
+        achievements = []
+        seen = set()
+
+        for match in ACHIEVEMENT_PATTERN.finditer(text):
+            description = normalize_achievement(match.group())
+            key = achievement_key(description)
+            if key not in seen:
+                seen.add(key)
+                achievements.append({
+                    "description": description,
+                    "source_url": url,
+                    "verified": True
+                })
+
+        return achievements
+
+
+class NearDuplicateDetector:
+    """
+    Finds near-duplicate records (same text up to whitespace, punctuation or a short suffix)
+    with word shingling, MinHash signatures and LSH banding.
+
+    The MinHash "permutations" XOR each 32-bit shingle hash with a random mask, which keeps
+    signatures cheap to compute; candidates are always confirmed with exact Jaccard anyway.
+
+    Each record is hashed into `bands` buckets; only records sharing a bucket with an earlier
+    cluster's representative are compared, by exact Jaccard similarity of their shingle sets.
+    Buckets only ever hold cluster representatives, so the work stays roughly linear in the
+    number of records even when many of them are copies of each other.
+    """
+
+    def __init__(self, threshold=0.8, num_perm=64, bands=16, shingle_size=3, seed=1):
+        rng = random.Random(seed)
+        self.threshold = threshold
+        self.bands = bands
+        self.rows = num_perm // bands
+        self.shingle_size = shingle_size
+        self._masks = [rng.getrandbits(32) for _ in range(num_perm)]
+
+    def shingles(self, text):
+        """Word n-gram shingles of the text, lowercased with punctuation and whitespace ignored"""
+        words = re.sub(r'[^\w\s]', ' ', text.lower()).split()
+        if len(words) <= self.shingle_size:
+            return {' '.join(words)} if words else set()
+        return {' '.join(words[i:i + self.shingle_size]) for i in range(len(words) - self.shingle_size + 1)}
+
+    def signature(self, shingles):
+        hashes = [zlib.crc32(shingle.encode()) for shingle in shingles]
+        return [min(map(mask.__xor__, hashes)) for mask in self._masks]
+
+    def dedupe(self, records, key):
+        """
+        Collapse near-duplicates, keeping the first record of each cluster in order.
+        Returns (kept records, [(kept record, [records merged into it]), ...]).
+        """
+        kept = []
+        kept_shingles = []
+        buckets = {}
+        merged = {}
+
+        for record in records:
+            shingles = self.shingles(key(record))
+            if not shingles:
+                kept.append(record)
+                kept_shingles.append(shingles)
+                continue
+
+            signature = self.signature(shingles)
+            band_keys = [(band, tuple(signature[band * self.rows:(band + 1) * self.rows])) for band in range(self.bands)]
+
+            match = None
+            checked = set()
+            for band_key in band_keys:
+                for position in buckets.get(band_key, ()):
+                    if position in checked:
+                        continue
+                    checked.add(position)
+                    other = kept_shingles[position]
+                    if len(shingles & other) / len(shingles | other) >= self.threshold:
+                        match = position
+                        break
+                if match is not None:
+                    break
+
+            if match is None:
+                for band_key in band_keys:
+                    buckets.setdefault(band_key, []).append(len(kept))
+                kept.append(record)
+                kept_shingles.append(shingles)
+            else:
+                merged.setdefault(match, []).append(record)
+
+        return kept, [(kept[position], duplicates) for position, duplicates in merged.items()]
+
+
+def percentile(values, q):
+    """Nearest-rank percentile of a list of numbers (q in 0-100), or None when it is empty"""
+    if not values:
+        return None
+    ordered = sorted(values)
+    return ordered[max(0, min(len(ordered) - 1, math.ceil(q * len(ordered) / 100) - 1))]
+
+
+class CrawlMetrics:
+    """
+    Per-page measurements for one crawl: fetch latency, bytes on the wire, parse time,
+    seconds per extractor stage and records extracted, plus the per-brand aggregates
+    written to the crawl report
+    """
+
+    RECORD_TYPES = ('testimonials', 'team_members', 'services', 'achievements')
+
+    def __init__(self):
+        self.pages = {}
+        self.started = time.perf_counter()
+        self.finished = None
+
+    def start(self):
+        self.started = time.perf_counter()
+        self.finished = None
+
+    def finish(self):
+        self.finished = time.perf_counter()
+
+    def record(self, url, **values):
+        """Merge measurements into a page's entry"""
+        self.pages.setdefault(url, {"url": url}).update(values)
+
+    def total_bytes(self):
+        return sum(page.get('bytes', 0) for page in self.pages.values())
+
+    @staticmethod
+    def _distribution(values):
+        return {
+            "p50": percentile(values, 50),
+            "p95": percentile(values, 95),
+            "max": max(values) if values else None,
+            "total": sum(values)
+        }
+
+    def summary(self):
+        """Aggregate the per-page entries into brand-level throughput and latency figures"""
+        pages = list(self.pages.values())
+        crawled = [page for page in pages if page.get('status') != 'failed']
+        wall_seconds = (self.finished or time.perf_counter()) - self.started
+        total_bytes = self.total_bytes()
+
+        stages = {}
+        for page in crawled:
+            for stage, seconds in page.get('extract_seconds', {}).items():
+                stages.setdefault(stage, []).append(seconds)
+
+        return {
+            "pages": len(crawled),
+            "failed": len(pages) - len(crawled),
+            "wall_seconds": wall_seconds,
+            "pages_per_second": len(crawled) / wall_seconds if wall_seconds else None,
+            "bytes": total_bytes,
+            "bytes_per_second": total_bytes / wall_seconds if wall_seconds else None,
+            "fetch_seconds": self._distribution([p['fetch_seconds'] for p in pages if 'fetch_seconds' in p]),
+            "parse_seconds": self._distribution([p['parse_seconds'] for p in crawled if 'parse_seconds' in p]),
+            "extract_seconds": {stage: self._distribution(values) for stage, values in stages.items()},
+            "records": {
+                record_type: sum(page.get('records', {}).get(record_type, 0) for page in crawled)
+                for record_type in self.RECORD_TYPES
+            },
+            "slowest_pages": [
+                page['url'] for page in sorted(
+                    crawled, key=lambda p: p.get('fetch_seconds', 0) + p.get('parse_seconds', 0), reverse=True
+                )[:5]
+            ]
+        }
+
+    def report(self):
+        return {"summary": self.summary(), "pages": list(self.pages.values())}
+
+
+class CrawlState:
+    """Per-URL validators and extracted records from the previous crawl of one host, for incremental re-crawls"""
+
+    def __init__(self, host, directory=os.path.join(CRAWL_CACHE_DIR, "state")):
+        self.path = os.path.join(directory, f"{host.replace(':', '_')}.json")
+        self.pages = {}
+        # Fetch threads update pages while the event loop checkpoints it
+        self._lock = threading.Lock()
+        if os.path.exists(self.path):
+            try:
+                with open(self.path, 'r') as f:
+                    self.pages = json.load(f)
+            except (OSError, json.JSONDecodeError) as e:
+                print(f"Ignoring unreadable crawl state {self.path}: {str(e)}")
+
+    def get(self, key):
+        return self.pages.get(key)
+
+    def update(self, key, etag, last_modified, content_hash, page):
+        entry = {
+            "etag": etag,
+            "last_modified": last_modified,
+            "content_hash": content_hash,
+            "crawled_at": datetime.now(timezone.utc).isoformat(),
+            "page": page
+        }
+        with self._lock:
+            self.pages[key] = entry
+
+    def save(self, keep=None):
+        """Atomically write the state, dropping pages that were not part of this crawl"""
+        with self._lock:
+            if keep is not None:
+                self.pages = {key: value for key, value in self.pages.items() if key in keep}
+            pages = dict(self.pages)
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        tmp_path = f"{self.path}.{threading.get_ident()}.tmp"
+        with open(tmp_path, 'w') as f:
+            json.dump(pages, f)
+        os.replace(tmp_path, self.path)
+
+
+class CrawlCheckpoint:
+    """SQLite store of in-progress and finished crawls, keyed by host, so an interrupted refresh can resume"""
+
+    def __init__(self, path=os.path.join(CRAWL_CACHE_DIR, "checkpoints.sqlite")):
+        self.path = path
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        with closing(sqlite3.connect(self.path)) as conn, conn:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS checkpoints ("
+                "host TEXT PRIMARY KEY, finished INTEGER NOT NULL, state TEXT NOT NULL, updated_at TEXT NOT NULL)"
+            )
+
+    def save(self, host, state, finished=False):
+        with closing(sqlite3.connect(self.path)) as conn, conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO checkpoints (host, finished, state, updated_at) VALUES (?, ?, ?, ?)",
+                (host, int(finished), json.dumps(state), datetime.now().isoformat())
+            )
+
+    def load(self, host):
+        """Return (state, finished) for a host, or None if it has no checkpoint"""
+        with closing(sqlite3.connect(self.path)) as conn:
+            row = conn.execute("SELECT state, finished FROM checkpoints WHERE host = ?", (host,)).fetchone()
+        return (json.loads(row[0]), bool(row[1])) if row else None
+
+    def clear(self):
+        with closing(sqlite3.connect(self.path)) as conn, conn:
+            conn.execute("DELETE FROM checkpoints")
+
+
+class CacheMiss(Exception):
+    """Raised in replay mode when a page was never cached"""
+
+
+class PageRejected(Exception):
+    """Raised when a response is not HTML or is larger than the page size cap"""
+
+
+class PageResponse:
+    """The parts of an HTTP response the crawler uses, from a streamed download or the on-disk cache"""
+
+    def __init__(self, url, status_code, headers, content, bytes_transferred=0):
+        self.url = url
+        self.status_code = status_code
+        self.headers = CaseInsensitiveDict(headers)
+        self.content = content
+        self.bytes_transferred = bytes_transferred
+
+
+class ResponseCache:
+    """
+    Content-addressed on-disk cache of fetched pages for offline development runs.
+
+    Bodies are stored once per SHA-256 under blobs/, and index.json maps each canonical URL
+    to its blob, status, headers and last use. When the blobs outgrow max_bytes the least
+    recently used URLs are evicted along with any blob no other URL still references.
+    """
+
+    CACHED_HEADERS = ('Content-Type', 'ETag', 'Last-Modified')
+
+    def __init__(self, directory=os.path.join(CRAWL_CACHE_DIR, "http"), max_bytes=200 * 1024 * 1024):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.index_path = os.path.join(directory, "index.json")
+        self.entries = {}
+        self._lock = threading.Lock()
+        if os.path.exists(self.index_path):
+            try:
+                with open(self.index_path, 'r') as f:
+                    self.entries = json.load(f)
+            except (OSError, json.JSONDecodeError) as e:
+                print(f"Ignoring unreadable response cache index {self.index_path}: {str(e)}")
+
+    def _blob_path(self, digest):
+        return os.path.join(self.directory, "blobs", digest[:2], digest)
+
+    def get(self, key):
+        """Return the cached response for a canonical URL, or None"""
+        with self._lock:
+            entry = self.entries.get(key)
+            if not entry:
+                return None
+            try:
+                with open(self._blob_path(entry['sha256']), 'rb') as f:
+                    content = f.read()
+            except OSError:
+                del self.entries[key]
+                return None
+            entry['last_used'] = time.time()
+        return PageResponse(entry['url'], entry['status'], entry['headers'], content)
+
+    def put(self, key, response):
+        """Store a fetched response under its canonical URL"""
+        content = response.content
+        digest = hashlib.sha256(content).hexdigest()
+        blob_path = self._blob_path(digest)
+        with self._lock:
+            if not os.path.exists(blob_path):
+                os.makedirs(os.path.dirname(blob_path), exist_ok=True)
+                tmp_path = f"{blob_path}.tmp"
+                with open(tmp_path, 'wb') as f:
+                    f.write(content)
+                os.replace(tmp_path, blob_path)
+            self.entries[key] = {
+                "url": response.url,
+                "status": response.status_code,
+                "headers": {name: response.headers[name] for name in self.CACHED_HEADERS if name in response.headers},
+                "sha256": digest,
+                "size": len(content),
+                "last_used": time.time()
+            }
+            self._evict()
+
+    def _evict(self):
+        """Drop least recently used URLs until the unique blobs fit in max_bytes"""
+        blob_sizes = {entry['sha256']: entry['size'] for entry in self.entries.values()}
+        total = sum(blob_sizes.values())
+        if total <= self.max_bytes:
+            return
+
+        references = {}
+        for entry in self.entries.values():
+            references[entry['sha256']] = references.get(entry['sha256'], 0) + 1
+
+        for key in sorted(self.entries, key=lambda k: self.entries[k]['last_used']):
+            if total <= self.max_bytes:
+                break
+            digest = self.entries.pop(key)['sha256']
+            references[digest] -= 1
+            if not references[digest]:
+                total -= blob_sizes[digest]
+                try:
+                    os.remove(self._blob_path(digest))
+                except OSError:
+                    pass
+
+    def iter_bodies(self):
+        """Yield (url, body) for every cached page, e.g. as a benchmark corpus"""
+        for key in sorted(self.entries):
+            response = self.get(key)
+            if response is not None:
+                yield key, response.content
+
+    def save(self):
+        """Atomically write the index"""
+        with self._lock:
+            os.makedirs(self.directory, exist_ok=True)
+            tmp_path = f"{self.index_path}.tmp"
+            with open(tmp_path, 'w') as f:
+                json.dump(self.entries, f)
+            os.replace(tmp_path, self.index_path)
+
+
 class WebsiteCrawler:
-    def __init__(self, base_url, max_pages=30):
+    def __init__(self, base_url, max_pages=30, max_concurrency_per_host=6, min_request_interval=0.1, label=None,
+                 prioritize=True, incremental=False, parser='auto', cache=None, replay=False,
+                 checkpoint=None, resume=False, checkpoint_every=5, respect_robots=True, use_sitemaps=True,
+                 max_page_bytes=5 * 1024 * 1024, session=None, retries=3):
         self.base_url = base_url
+        self.start_url = canonicalize_url(base_url, strip_trailing_slash=False)
+        self.scheme = urlsplit(self.start_url).scheme
+        self.host = urlsplit(self.start_url).netloc
+        self.label = label
+        self.prioritize = prioritize
         self.max_pages = max_pages
+        self.max_concurrency_per_host = max_concurrency_per_host
+        self.min_request_interval = min_request_interval
+        self.max_page_bytes = max_page_bytes
+        self.headers = {
+            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36',
+            'Accept': 'text/html,application/xhtml+xml;q=0.9,*/*;q=0.1',
+            'Accept-Encoding': ACCEPT_ENCODING
+        }
+        # Pooled keep-alive connections, shared across brands when crawl_all_brands passes one in
+        self.session = session or create_session(pool_size=max_concurrency_per_host, retries=retries)
+        self.parser = resolve_parser(parser)
+        self.extractor = PageExtractor()
+        self.near_duplicates = NearDuplicateDetector()
+        self.seen_achievements = set()
+        self.dedup_report = {}
         self.visited_urls = set()
+        self.unchanged_urls = set()
+        self.failed_urls = {}
+        self.metrics = CrawlMetrics()
+        self.state = CrawlState(self.host) if incremental else None
+        self.cache = cache or (ResponseCache() if replay else None)
+        self.replay = replay
+        self.checkpoint = checkpoint
+        self.resume = resume
+        self.checkpoint_every = checkpoint_every
+        self._checkpointed_pages = 0
+        self.respect_robots = respect_robots
+        self.use_sitemaps = use_sitemaps
+        self.robots = None
+        self.crawl_delay = None
+        self.sitemap_lastmod = {}
         self.content = {
             "crawl_date": datetime.now().isoformat(),
             "base_url": base_url,
@@ -28,152 +1044,232 @@ class WebsiteCrawler:
             "all_pages": []
         }
 
+    def _allowed(self, url):
+        """Check the host's robots.txt rules for a URL"""
+        return self.robots is None or self.robots.can_fetch(self.headers['User-Agent'], url)
+
+    def discover(self, frontier, seed=True):
+        """
+        Read robots.txt (disallow rules and Crawl-delay) and, if seed is set, add every page listed
+        in the site's sitemaps to the frontier, remembering their lastmod dates
+        """
+        if self.replay:
+            return  # Offline: nothing to fetch
+
+        origin = f"{self.scheme}://{self.host}"
+        if self.respect_robots:
+            self.robots = fetch_robots(origin, self.headers, self.session)
+            self.crawl_delay = self.robots.crawl_delay(self.headers['User-Agent'])
+
+        if not (seed and self.use_sitemaps):
+            return
+
+        sitemaps = deque((self.robots.site_maps() if self.robots else None) or [f"{origin}/sitemap.xml"])
+        seen_sitemaps = set()
+        seeded = 0
+        while sitemaps and len(seen_sitemaps) < MAX_SITEMAPS and seeded < MAX_SITEMAP_URLS:
+            sitemap_url = sitemaps.popleft()
+            if sitemap_url in seen_sitemaps:
+                continue
+            seen_sitemaps.add(sitemap_url)
+
+            try:
+                with self.session.get(sitemap_url, headers=self.headers, timeout=10, stream=True) as response:
+                    response.raise_for_status()
+                    for kind, loc, lastmod in iter_sitemap(response):
+                        if kind == 'sitemap':
+                            sitemaps.append(loc)
+                            continue
+                        link = self.normalize_link(self.start_url, loc)
+                        if not link or not self._allowed(link):
+                            continue
+                        if lastmod and parse_lastmod(lastmod):
+                            self.sitemap_lastmod[self._url_key(link)] = parse_lastmod(lastmod)
+                        seeded += frontier.add(link)
+                        if seeded >= MAX_SITEMAP_URLS:
+                            break
+            except (requests.RequestException, ElementTree.ParseError, OSError) as e:
+                self._log(f"Skipping sitemap {sitemap_url}: {str(e)}")
+
+        if seeded:
+            self._log(f"Seeded {seeded} pages from {len(seen_sitemaps)} sitemap(s)")
+
+    def _unchanged_page(self, url):
+        """The previous crawl's extraction of a page whose sitemap lastmod predates that crawl, or None"""
+        if not self.state:
+            return None
+        key = self._url_key(url)
+        lastmod = self.sitemap_lastmod.get(key)
+        previous = self.state.get(key)
+        if not lastmod or not previous or not previous.get('crawled_at'):
+            return None
+        if lastmod > datetime.fromisoformat(previous['crawled_at']):
+            return None
+        self.unchanged_urls.add(url)
+        self.metrics.record(url, unchanged=True, source='sitemap')
+        return previous['page']
+
+    def _log(self, message):
+        """Print a progress line, prefixed with the crawler's label when several crawls share the console"""
+        print(f"[{self.label}] {message}" if self.label else message)
+
     def is_valid_url(self, url):
         """Check if URL belongs to the same domain"""
-        return urlparse(url).netloc == urlparse(self.base_url).netloc
+        return urlsplit(url).netloc.lower() == self.host
 
-    def extract_testimonials(self, soup, url):
-        """Extract testimonials from page"""
-        testimonials = []
+    def normalize_link(self, page_url, href):
+        """Resolve a link against its page and canonicalize it, or return None if it should not be crawled"""
+        full_url = urljoin(page_url, href)
+        if not is_crawlable_url(full_url):
+            return None
+        # Keep the trailing slash as linked so we don't pay for a redirect on every fetch;
+        # the frontier dedups on the fully canonical form instead
+        full_url = canonicalize_url(full_url, scheme=self.scheme, strip_trailing_slash=False)
+        return full_url if self.is_valid_url(full_url) else None
 
-        # Common testimonial patterns
-        testimonial_selectors = [
-            'div.testimonial',
-            'div[class*="testimonial"]',
-            'div[class*="review"]',
-            'div[class*="quote"]',
-            'blockquote',
-            'div[class*="client-feedback"]',
-            'div[class*="customer-review"]',
-        ]
+    def _url_key(self, url):
+        """Dedup key under which trailing-slash and scheme twins of a page collapse together"""
+        return canonicalize_url(url, scheme=self.scheme)
 
-        for selector in testimonial_selectors:
-            elements = soup.select(selector)
-            for elem in elements:
-                text = elem.get_text(strip=True)
-                if len(text) > 50 and len(text) < 1000:  # Reasonable testimonial length
-                    # Try to extract author name
-                    author = ""
-                    author_selectors = [
-                        'cite', 'span.author', 'p.author',
-                        'div.name', 'span.name', 'p.name',
-                        'div[class*="author"]', 'span[class*="author"]'
-                    ]
-                    for author_sel in author_selectors:
-                        author_elem = elem.select_one(author_sel)
-                        if author_elem:
-                            author = author_elem.get_text(strip=True)
-                            break
+    def fetch_page(self, url):
+        """Return a page from the response cache if enabled, otherwise download it"""
+        started = time.perf_counter()
+        if self.cache:
+            key = self._url_key(url)
+            cached = self.cache.get(key)
+            if cached is not None:
+                self.metrics.record(url, source='cache', fetch_seconds=time.perf_counter() - started)
+                return cached
+            if self.replay:
+                raise CacheMiss(f"not in the response cache: {url}")
 
-                    testimonials.append({
-                        "quote": text,
-                        "author": author if author else "Anonymous",
-                        "source_url": url,
-                        "verified": True,
-                        "extracted_date": datetime.now().isoformat()
-                    })
+        response = self._download(url)
+        self.metrics.record(url, source='network', fetch_seconds=time.perf_counter() - started)
+        if self.cache and response.status_code == 200:
+            self.cache.put(key, response)
+        return response
 
-        return testimonials
+    def _download(self, url):
+        """
+        Stream a page, sending conditional headers when the previous crawl left validators.
+        Non-HTML responses are aborted after the headers, and bodies over max_page_bytes mid-stream.
+        """
+        headers = self.headers
+        previous = self.state.get(self._url_key(url)) if self.state else None
+        if previous:
+            headers = dict(headers)
+            if previous.get('etag'):
+                headers['If-None-Match'] = previous['etag']
+            if previous.get('last_modified'):
+                headers['If-Modified-Since'] = previous['last_modified']
 
-    def extract_team_members(self, soup, url):
-        """Extract team member information"""
-        team = []
+        with self.session.get(url, headers=headers, timeout=10, stream=True) as response:
+            response.raise_for_status()
+            if response.status_code == 304:
+                return PageResponse(response.url, 304, response.headers, b'', response.raw.tell())
 
-        team_selectors = [
-            'div[class*="team"]',
-            'div[class*="staff"]',
-            'div[class*="member"]',
-            'div[class*="attorney"]',
-            'div[class*="lawyer"]',
-            'div[class*="expert"]',
-        ]
+            content_type = response.headers.get('Content-Type', '').split(';')[0].strip().lower()
+            if content_type and content_type not in HTML_CONTENT_TYPES:
+                raise PageRejected(f"not HTML ({content_type})")
+            declared_length = response.headers.get('Content-Length', '')
+            if declared_length.isdigit() and int(declared_length) > self.max_page_bytes:
+                raise PageRejected(f"{int(declared_length)} bytes exceeds the {self.max_page_bytes} byte cap")
 
-        for selector in team_selectors:
-            elements = soup.select(selector)
-            for elem in elements:
-                name_elem = elem.select_one('h3, h4, h5, strong, .name, [class*="name"]')
-                title_elem = elem.select_one('.title, [class*="title"], [class*="position"]')
-                bio_elem = elem.select_one('p, .bio, [class*="bio"]')
+            body = bytearray()
+            for chunk in response.iter_content(chunk_size=64 * 1024):
+                body += chunk
+                if len(body) > self.max_page_bytes:
+                    raise PageRejected(f"body exceeds the {self.max_page_bytes} byte cap")
 
-                if name_elem:
-                    team.append({
-                        "name": name_elem.get_text(strip=True),
-                        "title": title_elem.get_text(strip=True) if title_elem else "",
-                        "bio": bio_elem.get_text(strip=True) if bio_elem else "",
-                        "source_url": url
-                    })
+            # raw.tell() counts bytes off the wire, i.e. before gzip/brotli decoding
+            return PageResponse(response.url, response.status_code, response.headers, bytes(body), response.raw.tell())
 
-        return team
+    def load_page(self, url, response):
+        """Parse a fetched page, reusing the previous crawl's extraction on a 304 or an unchanged body"""
+        self.metrics.record(url, status=response.status_code, bytes=response.bytes_transferred,
+                            body_bytes=len(response.content))
+        if not self.state:
+            return self.parse_page(url, response.content)
 
-    def extract_services(self, soup, url):
-        """Extract services or features"""
-        services = []
+        key = self._url_key(url)
+        previous = self.state.get(key)
+        if response.status_code == 304:
+            if not previous:
+                raise ValueError("304 Not Modified without a previous crawl of this page")
+            self.unchanged_urls.add(url)
+            self.metrics.record(url, unchanged=True)
+            return previous['page']
 
-        service_selectors = [
-            'div[class*="service"]',
-            'div[class*="feature"]',
-            'div[class*="offering"]',
-            'li[class*="service"]',
-        ]
+        content_hash = hashlib.sha256(response.content).hexdigest()
+        if previous and previous['content_hash'] == content_hash:
+            self.unchanged_urls.add(url)
+            self.metrics.record(url, unchanged=True)
+            page = previous['page']
+        else:
+            page = self.parse_page(url, response.content)
 
-        for selector in service_selectors:
-            elements = soup.select(selector)
-            for elem in elements:
-                title_elem = elem.select_one('h2, h3, h4, strong')
-                desc_elem = elem.select_one('p')
+        self.state.update(
+            key,
+            etag=response.headers.get('ETag'),
+            last_modified=response.headers.get('Last-Modified'),
+            content_hash=content_hash,
+            page=page
+        )
+        return page
 
-                if title_elem:
-                    services.append({
-                        "title": title_elem.get_text(strip=True),
-                        "description": desc_elem.get_text(strip=True) if desc_elem else "",
-                        "source_url": url
-                    })
+    def parse_page(self, url, html):
+        """Extract all content types and same-site links from a page's HTML"""
+        started = time.perf_counter()
+        soup = BeautifulSoup(html, self.parser)
 
-        return services
+        links = []
+        for link in soup.find_all('a', href=True):
+            full_url = self.normalize_link(url, link['href'])
+            if full_url:
+                links.append(full_url)
 
-    def extract_achievements(self, soup, url):
-        """Extract achievements, metrics, or success stories"""
-        achievements = []
+        page = {
+            "url": url,
+            "title": str(soup.title.string) if soup.title and soup.title.string else ""
+        }
+        parse_seconds = time.perf_counter() - started
+        extract_seconds = {}
+        page.update(self.extractor.extract(soup, url, timings=extract_seconds))
+        page["links"] = links
 
-        # Look for numbers followed by achievements
-        text = soup.get_text()
+        self.metrics.record(url, parse_seconds=parse_seconds, extract_seconds=extract_seconds, records={
+            record_type: len(page[record_type]) for record_type in CrawlMetrics.RECORD_TYPES
+        })
+        return page
 
-        # Patterns like "500+ clients", "95% success rate", "$10M raised"
-        number_patterns = [
-            r'(\d+[\+%]?\s+(?:clients|customers|cases|applications|visas|approvals|years|success))',
-            r'(\d+%\s+(?:success|approval|satisfaction|rate))',
-            r'(\$[\d,]+[MKB]?\s+(?:raised|funded|saved))',
-        ]
+    def record_page(self, page):
+        """Merge a parsed page into the crawl content and return its unvisited links"""
+        self.visited_urls.add(page['url'])
 
-        for pattern in number_patterns:
-            matches = re.findall(pattern, text, re.IGNORECASE)
-            for match in matches:
-                if match not in [a['description'] for a in achievements]:
-                    achievements.append({
-                        "description": match,
-                        "source_url": url,
-                        "verified": True
-                    })
+        # Update content
+        self.content['testimonials'].extend(page['testimonials'])
+        self.content['team_members'].extend(page['team_members'])
+        self.content['services'].extend(page['services'])
 
-        return achievements
+        # The same "500+ clients" banner appears on every page; keep its first occurrence only
+        for achievement in page['achievements']:
+            key = achievement_key(achievement['description'])
+            if key not in self.seen_achievements:
+                self.seen_achievements.add(key)
+                self.content['achievements'].append(achievement)
 
-    def extract_about_text(self, soup):
-        """Extract about/mission text"""
-        about_selectors = [
-            'div[class*="about"]',
-            'div[class*="mission"]',
-            'div[class*="story"]',
-            'section[class*="about"]',
-        ]
+        # Get about text if we don't have it yet
+        if not self.content['about_text'] and page['about_text']:
+            self.content['about_text'] = page['about_text']
 
-        for selector in about_selectors:
-            elem = soup.select_one(selector)
-            if elem:
-                text = elem.get_text(strip=True)
-                if len(text) > 100:
-                    return text[:1000]  # Limit length
+        # Store page info
+        self.content['all_pages'].append({
+            "url": page['url'],
+            "title": page['title'],
+            "crawled_date": datetime.now().isoformat()
+        })
 
-        return ""
+        return [link for link in page['links'] if link not in self.visited_urls and self._allowed(link)]
 
     def crawl_page(self, url):
         """Crawl a single page"""
@@ -181,80 +1277,218 @@ class WebsiteCrawler:
             return []
 
         try:
-            print(f"Crawling: {url}")
-            headers = {
-                'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
-            }
-            response = requests.get(url, headers=headers, timeout=10)
-            response.raise_for_status()
+            page = self._unchanged_page(url)
+            fetched = page is None
+            if fetched:
+                self._log(f"Crawling: {url}")
+                page = self.load_page(url, self.fetch_page(url))
+            links = self.record_page(page)
 
-            self.visited_urls.add(url)
-            soup = BeautifulSoup(response.content, 'html.parser')
-
-            # Extract all content types
-            testimonials = self.extract_testimonials(soup, url)
-            team = self.extract_team_members(soup, url)
-            services = self.extract_services(soup, url)
-            achievements = self.extract_achievements(soup, url)
-
-            # Update content
-            self.content['testimonials'].extend(testimonials)
-            self.content['team_members'].extend(team)
-            self.content['services'].extend(services)
-            self.content['achievements'].extend(achievements)
-
-            # Get about text if we don't have it yet
-            if not self.content['about_text']:
-                about = self.extract_about_text(soup)
-                if about:
-                    self.content['about_text'] = about
-
-            # Store page info
-            self.content['all_pages'].append({
-                "url": url,
-                "title": soup.title.string if soup.title else "",
-                "crawled_date": datetime.now().isoformat()
-            })
-
-            # Find links to other pages
-            links = []
-            for link in soup.find_all('a', href=True):
-                full_url = urljoin(url, link['href'])
-                if self.is_valid_url(full_url) and full_url not in self.visited_urls:
-                    links.append(full_url)
-
-            # Slight delay to be respectful
-            time.sleep(0.5)
+            # Slight delay to be respectful (replays never touch the network)
+            if fetched and not self.replay:
+                time.sleep(max(0.5, self.crawl_delay or 0))
 
             return links
 
         except Exception as e:
-            print(f"Error crawling {url}: {str(e)}")
+            self._record_failure(url, e)
             return []
 
+    def _record_failure(self, url, error):
+        """Log a page that could not be crawled and keep it for the crawl summary"""
+        if isinstance(error, (requests.RequestException, PageRejected, CacheMiss)):
+            reason = str(error)
+        else:
+            reason = f"{type(error).__name__}: {error}"
+        self.failed_urls[url] = reason
+        self.metrics.record(url, status='failed', error=reason)
+        self._log(f"Error crawling {url}: {reason}")
+
+    def _start_frontier(self):
+        """
+        Create the crawl frontier, seeded with the base URL or restored from the checkpoint
+        when resuming. Returns None if the checkpoint says this crawl already finished.
+        """
+        frontier = CrawlFrontier(scorer=score_url if self.prioritize else None, key=self._url_key)
+        saved = self.checkpoint.load(self.host) if self.checkpoint and self.resume else None
+        if not saved:
+            frontier.add(self.start_url)
+            return frontier
+
+        state, finished = saved
+        self.content = state['content']
+        if finished:
+            self._log(f"Already crawled, using checkpointed content for {self.base_url}")
+            return None
+
+        self.visited_urls = set(state['visited_urls'])
+        self.seen_achievements = {achievement_key(a['description']) for a in self.content['achievements']}
+        self._checkpointed_pages = len(self.visited_urls)
+        frontier.restore(state['frontier'])
+        self._log(f"Resuming from checkpoint: {len(self.visited_urls)} pages done, {len(frontier)} queued")
+        return frontier
+
+    def _save_checkpoint(self, frontier, pending=()):
+        """Persist the frontier, visited set and content collected so far"""
+        self.checkpoint.save(self.host, {
+            "visited_urls": sorted(self.visited_urls),
+            "content": self.content,
+            "frontier": frontier.to_dict(pending)
+        })
+        self._checkpointed_pages = len(self.visited_urls)
+        if self.state:
+            self.state.save()
+        if self.cache:
+            self.cache.save()
+
+    def _maybe_checkpoint(self, frontier, pending=()):
+        """Checkpoint once every checkpoint_every newly visited pages"""
+        if self.checkpoint and len(self.visited_urls) - self._checkpointed_pages >= self.checkpoint_every:
+            self._save_checkpoint(frontier, pending)
+
     def crawl(self):
         """Start crawling from base URL"""
-        to_visit = [self.base_url]
+        self.metrics.start()
+        frontier = self._start_frontier()
+        if frontier is None:
+            return self.content
+        self.discover(frontier, seed=not self.visited_urls)
 
-        while to_visit and len(self.visited_urls) < self.max_pages:
-            url = to_visit.pop(0)
-            new_links = self.crawl_page(url)
-            to_visit.extend([link for link in new_links if link not in to_visit])
+        url = None
+        try:
+            while frontier and len(self.visited_urls) < self.max_pages:
+                url = frontier.pop()
+                for link in self.crawl_page(url):
+                    frontier.add(link)
+                url = None
+                self._maybe_checkpoint(frontier)
+        except BaseException:
+            # Interrupted (Ctrl-C, crash): keep everything up to here, including the unfinished page
+            if self.checkpoint:
+                self._save_checkpoint(frontier, [url] if url else [])
+            raise
 
+        return self._finish_crawl()
+
+    async def _crawl_page_async(self, url, limiter, executor):
+        """Fetch and parse a page off the event loop, then merge it into the content"""
+        loop = asyncio.get_running_loop()
+        try:
+            page = self._unchanged_page(url)
+            if page is None:
+                async with limiter.slot(url):
+                    self._log(f"Crawling: {url}")
+                    response = await loop.run_in_executor(executor, self.fetch_page, url)
+                page = await loop.run_in_executor(executor, self.load_page, url, response)
+        except Exception as e:
+            self._record_failure(url, e)
+            return []
+
+        return self.record_page(page)
+
+    async def crawl_async(self, limiter=None, executor=None):
+        """Crawl with several requests in flight per host; returns the same content as crawl()"""
+        limiter = limiter or HostRateLimiter(self.max_concurrency_per_host,
+                                             0 if self.replay else self.min_request_interval)
+        own_executor = executor is None
+        if own_executor:
+            executor = ThreadPoolExecutor(max_workers=self.max_concurrency_per_host)
+
+        self.metrics.start()
+        frontier = self._start_frontier()
+        if frontier is None:
+            if own_executor:
+                executor.shutdown(wait=False)
+            return self.content
+
+        in_flight = {}
+
+        try:
+            await asyncio.get_running_loop().run_in_executor(executor, self.discover, frontier,
+                                                             not self.visited_urls)
+            if self.crawl_delay:
+                limiter.set_min_interval(self.host, self.crawl_delay)
+
+            while frontier or in_flight:
+                # Never schedule more pages than the remaining budget allows
+                while frontier and len(self.visited_urls) + len(in_flight) < self.max_pages:
+                    url = frontier.pop()
+                    in_flight[asyncio.ensure_future(self._crawl_page_async(url, limiter, executor))] = url
+
+                if not in_flight:
+                    break
+
+                done, _ = await asyncio.wait(in_flight, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    links = task.result()
+                    del in_flight[task]
+                    for link in links:
+                        frontier.add(link)
+                self._maybe_checkpoint(frontier, in_flight.values())
+        except BaseException:
+            # Interrupted (Ctrl-C, crash): keep everything up to here; in-flight pages are re-queued
+            for task in in_flight:
+                task.cancel()
+            if self.checkpoint:
+                self._save_checkpoint(frontier, in_flight.values())
+            raise
+        finally:
+            if own_executor:
+                executor.shutdown(wait=False)
+
+        return self._finish_crawl()
+
+    def _finish_crawl(self):
+        """Deduplicate the collected content and print a summary"""
         # Remove duplicates
         self.content['testimonials'] = self._remove_duplicate_testimonials(self.content['testimonials'])
         self.content['team_members'] = self._remove_duplicate_team(self.content['team_members'])
         self.content['services'] = self._remove_duplicate_services(self.content['services'])
 
-        print(f"\nCrawl complete!")
-        print(f"Pages crawled: {len(self.visited_urls)}")
-        print(f"Testimonials found: {len(self.content['testimonials'])}")
-        print(f"Team members found: {len(self.content['team_members'])}")
-        print(f"Services found: {len(self.content['services'])}")
-        print(f"Achievements found: {len(self.content['achievements'])}")
+        print()
+        self._log(f"Crawl complete!")
+        self._log(f"Pages crawled: {len(self.visited_urls)}")
+        self._log(f"Testimonials found: {len(self.content['testimonials'])}")
+        self._log(f"Team members found: {len(self.content['team_members'])}")
+        self._log(f"Services found: {len(self.content['services'])}")
+        self._log(f"Achievements found: {len(self.content['achievements'])}")
+        self.metrics.finish()
+        summary = self.metrics.summary()
+        self._log(f"Bytes transferred: {summary['bytes'] / 1024:.0f} KB")
+        if summary['fetch_seconds']['p50'] is not None:
+            self._log(f"Fetch p50/p95: {summary['fetch_seconds']['p50'] * 1000:.0f}/"
+                      f"{summary['fetch_seconds']['p95'] * 1000:.0f} ms, "
+                      f"{summary['pages_per_second']:.1f} pages/s")
+        if self.failed_urls:
+            self._log(f"Pages failed: {len(self.failed_urls)}")
+            for url, reason in self.failed_urls.items():
+                self._log(f"  {url}: {reason}")
+        for content_type, merges in self.dedup_report.items():
+            if merges:
+                absorbed = sum(len(merge['merged']) for merge in merges)
+                self._log(f"Near-duplicate {content_type.replace('_', ' ')} merged: {absorbed} into {len(merges)}")
+                for merge in merges:
+                    self._log(f"  kept {merge['kept']!r}, merged {len(merge['merged'])}")
+
+        if self.state:
+            self._log(f"Unchanged pages reused: {len(self.unchanged_urls)}")
+            self.state.save(keep={self._url_key(url) for url in self.visited_urls})
+        if self.cache:
+            self.cache.save()
+        if self.checkpoint:
+            self.checkpoint.save(self.host, {"content": self.content}, finished=True)
 
         return self.content
 
+    def _remove_near_duplicates(self, content_type, records, key):
+        """Merge near-duplicate records and remember which ones merged for the crawl summary"""
+        unique, merges = self.near_duplicates.dedupe(records, key)
+        self.dedup_report[content_type] = [
+            {"kept": key(kept)[:80], "merged": [key(duplicate)[:80] for duplicate in duplicates]}
+            for kept, duplicates in merges
+        ]
+        return unique, merges
+
     def _remove_duplicate_testimonials(self, testimonials):
         """Remove duplicate testimonials based on quote text"""
         seen = set()
@@ -264,6 +1498,12 @@ class WebsiteCrawler:
             if quote_key not in seen:
                 seen.add(quote_key)
                 unique.append(t)
+
+        # Nested selectors match the same testimonial with whitespace or author-suffix differences
+        unique, merges = self._remove_near_duplicates('testimonials', unique, lambda t: t['quote'])
+        for kept, duplicates in merges:
+            if kept['author'] == "Anonymous":
+                kept['author'] = next((d['author'] for d in duplicates if d['author'] != "Anonymous"), "Anonymous")
         return unique
 
     def _remove_duplicate_team(self, team):
@@ -274,6 +1514,7 @@ class WebsiteCrawler:
             if t['name'] not in seen:
                 seen.add(t['name'])
                 unique.append(t)
+        unique, _ = self._remove_near_duplicates('team_members', unique, lambda t: f"{t['name']} {t['bio']}")
         return unique
 
     def _remove_duplicate_services(self, services):
@@ -284,45 +1525,143 @@ class WebsiteCrawler:
             if s['title'] not in seen:
                 seen.add(s['title'])
                 unique.append(s)
+        # Only near-identical titles merge; distinct services often share boilerplate descriptions
+        unique, _ = self._remove_near_duplicates('services', unique, lambda s: s['title'])
         return unique
 
 
-def crawl_all_brands():
-    """Crawl all brand websites"""
-    brands = {
-        "sherrod-sports-visas": "https://www.sherrodsportsvisas.com",
-        "igta": "https://www.innovativeglobaltalent.com",
-        "aventus-visa-agents": "https://www.aventusvisaagents.com",
-        "camino-immigration": "https://www.caminoimmigration.com",
-        "innovative-automations": "https://www.innovativeautomations.dev"
+# Per-brand timing report, written next to the verified content shards
+CRAWL_REPORT_FILE = "config/crawl_report.json"
+
+BRAND_SITES = {
+    "sherrod-sports-visas": "https://www.sherrodsportsvisas.com",
+    "igta": "https://www.innovativeglobaltalent.com",
+    "aventus-visa-agents": "https://www.aventusvisaagents.com",
+    "camino-immigration": "https://www.caminoimmigration.com",
+    "innovative-automations": "https://www.innovativeautomations.dev"
+}
+
+
+async def crawl_brands_parallel(brands, max_concurrency=12, reports=None, **crawler_options):
+    """
+    Crawl every brand at once on one event loop, sharing a global request cap;
+    each brand's metrics report is stored in reports if given
+    """
+    limiter = HostRateLimiter(max_total=max_concurrency, min_interval=0 if crawler_options.get('replay') else 0.1)
+    timings = {}
+
+    with ThreadPoolExecutor(max_workers=max_concurrency) as executor:
+        async def crawl_brand(brand_id, url):
+            crawler = WebsiteCrawler(url, label=brand_id, **{"max_pages": 30, **crawler_options})
+            started = time.perf_counter()
+            content = await crawler.crawl_async(limiter=limiter, executor=executor)
+            timings[brand_id] = (len(crawler.visited_urls), time.perf_counter() - started)
+            if reports is not None:
+                reports[brand_id] = crawler.metrics.report()
+            print(f"✅ Completed {brand_id}: {timings[brand_id][0]} pages in {timings[brand_id][1]:.1f}s")
+            return brand_id, content
+
+        results = await asyncio.gather(*(crawl_brand(brand_id, url) for brand_id, url in brands.items()))
+
+    print(f"\n{'Brand':<28}{'Pages':>7}{'Seconds':>10}")
+    for brand_id, (pages, seconds) in timings.items():
+        print(f"{brand_id:<28}{pages:>7}{seconds:>10.1f}")
+
+    return dict(results)
+
+
+def crawl_all_brands(use_async=False, parallel=False, max_concurrency=12, incremental=False, parser='auto',
+                     use_cache=False, replay=False, cache_size_mb=200, resume=False, retries=3):
+    """Crawl all brand websites, optionally with the async engine and all brands in parallel"""
+    brands = BRAND_SITES
+    started = time.perf_counter()
+    store = VerifiedContentStore()
+
+    # Every run checkpoints as it goes; only --resume picks the checkpoints back up
+    checkpoint = CrawlCheckpoint()
+    if not resume:
+        checkpoint.clear()
+
+    # One pooled session for every brand, so connections are reused across the whole run
+    session = create_session(pool_size=max(6, max_concurrency), retries=retries, max_hosts=len(brands))
+
+    crawler_options = {
+        "session": session,
+        "incremental": incremental,
+        "parser": parser,
+        "cache": ResponseCache(max_bytes=cache_size_mb * 1024 * 1024) if use_cache or replay else None,
+        "replay": replay,
+        "checkpoint": checkpoint,
+        "resume": resume
     }
 
-    all_content = {}
+    reports = {}
+    if parallel:
+        all_content = asyncio.run(crawl_brands_parallel(brands, max_concurrency=max_concurrency, reports=reports,
+                                                        **crawler_options))
+        for brand_id, content in all_content.items():
+            store.put(brand_id, content)
+    else:
+        all_content = {}
 
-    for brand_id, url in brands.items():
-        print(f"\n{'='*60}")
-        print(f"Crawling {brand_id}: {url}")
-        print(f"{'='*60}")
+        for brand_id, url in brands.items():
+            print(f"\n{'='*60}")
+            print(f"Crawling {brand_id}: {url}")
+            print(f"{'='*60}")
 
-        crawler = WebsiteCrawler(url, max_pages=30)
-        content = crawler.crawl()
-        all_content[brand_id] = content
+            crawler = WebsiteCrawler(url, max_pages=30, **crawler_options)
+            if use_async:
+                content = asyncio.run(crawler.crawl_async())
+            else:
+                content = crawler.crawl()
+            all_content[brand_id] = content
+            reports[brand_id] = crawler.metrics.report()
+            store.put(brand_id, content)  # Each brand's shard is replaced as soon as it finishes
 
-        print(f"\n✅ Completed {brand_id}")
-        time.sleep(2)  # Delay between sites
+            print(f"\n✅ Completed {brand_id}")
+            if not use_async and not replay:
+                time.sleep(2)  # Delay between sites (the async engine rate-limits per host instead)
 
-    # Save to file
-    output_file = "config/verified_content.json"
-    with open(output_file, 'w') as f:
-        json.dump(all_content, f, indent=2)
+    checkpoint.clear()
+    session.close()
+
+    with open(CRAWL_REPORT_FILE, 'w') as f:
+        json.dump({"generated": datetime.now().isoformat(), "brands": reports}, f, indent=2)
 
     print(f"\n{'='*60}")
-    print(f"✅ All crawling complete!")
-    print(f"Data saved to: {output_file}")
+    print(f"✅ All crawling complete in {time.perf_counter() - started:.1f}s!")
+    print(f"Data saved to: {store.directory}/<brand-id>.json")
+    print(f"Crawl metrics saved to: {CRAWL_REPORT_FILE}")
     print(f"{'='*60}")
 
     return all_content
 
 
 if __name__ == "__main__":
-    crawl_all_brands()
+    parser = argparse.ArgumentParser(description="Crawl brand websites for verified content")
+    parser.add_argument("--async", dest="use_async", action="store_true",
+                        help="Keep several requests in flight per host instead of fetching one page at a time")
+    parser.add_argument("--parallel", action="store_true",
+                        help="Crawl all brands at the same time on one event loop (implies --async)")
+    parser.add_argument("--max-concurrency", type=int, default=12,
+                        help="Global cap on requests in flight across all brands in --parallel mode")
+    parser.add_argument("--incremental", action="store_true",
+                        help=f"Send conditional GETs and reuse unchanged pages' extractions (state kept in {CRAWL_CACHE_DIR}/)")
+    parser.add_argument("--parser", default="auto",
+                        help=f"HTML parser backend: auto (fastest installed), {', '.join(PARSER_BACKENDS)}")
+    parser.add_argument("--cache", dest="use_cache", action="store_true",
+                        help=f"Serve pages from the on-disk response cache in {CRAWL_CACHE_DIR}/http/ and store new ones")
+    parser.add_argument("--replay", action="store_true",
+                        help="Run entirely offline from the response cache; uncached pages are skipped")
+    parser.add_argument("--cache-size-mb", type=int, default=200,
+                        help="Evict least recently used pages once the response cache exceeds this size")
+    parser.add_argument("--resume", action="store_true",
+                        help="Continue an interrupted run from its checkpoints instead of starting from zero")
+    parser.add_argument("--retries", type=int, default=3,
+                        help="Retry connection errors and 429/5xx responses this many times, with jittered backoff")
+    args = parser.parse_args()
+
+    crawl_all_brands(use_async=args.use_async, parallel=args.parallel, max_concurrency=args.max_concurrency,
+                     incremental=args.incremental, parser=args.parser, use_cache=args.use_cache,
+                     replay=args.replay, cache_size_mb=args.cache_size_mb, resume=args.resume,
+                     retries=args.retries)
@@ -0,0 +1,598 @@
+"""
+Prompts for Landing Page Generation
+The brand-specific sections of the landing page prompt (verified testimonials, credentials,
+FAQs, quiz, pricing, ...) depend only on brands.json and the brand's verified content, so they
+are built once per load of those files and shared by every session and every A/B variation.
+
+Prompts are laid out from most to least stable - brand and philosophy, then the session's
+choices, then per-call feedback - with prompt cache breakpoints between the layers.
+"""
+
+import base64
+import threading
+from collections import OrderedDict
+
+
+class BrandPromptFragments:
+    """The prompt sections built from one load of a brand's config and verified content"""
+
+    __slots__ = ('verified_content', 'founder', 'credentials', 'trust_badges', 'faq',
+                 'press_mentions', 'eligibility_quiz', 'video_testimonials', 'live_chat',
+                 'multi_step_form', 'pricing')
+
+    def __init__(self, **sections):
+        for name in self.__slots__:
+            setattr(self, name, sections[name])
+
+
+def build_brand_fragments(brand, brand_content):
+    """Build every brand-specific prompt section from a Brand and its VerifiedContent"""
+    # Add verified content instructions
+    verified_content_instruction = """
+⚠️ CRITICAL TESTIMONIAL POLICY:
+"""
+
+    # Check if testimonials are available
+    has_testimonials = bool(brand_content.testimonials)
+
+    if has_testimonials:
+        verified_content_instruction += f"""
+VERIFIED TESTIMONIALS (Use ONLY these):
+{brand_content.testimonials_json}
+
+- You MUST use ONLY these verified testimonials
+- DO NOT modify or paraphrase these testimonials
+- Include attribution exactly as provided
+- You may use fewer testimonials, but NEVER create fake ones
+"""
+    else:
+        verified_content_instruction += """
+NO VERIFIED TESTIMONIALS AVAILABLE.
+
+⛔ DO NOT CREATE, FABRICATE, OR MAKE UP ANY TESTIMONIALS
+⛔ DO NOT include a testimonials section if no verified testimonials exist
+⛔ DO NOT use placeholder testimonials
+⛔ DO NOT paraphrase or invent customer quotes
+
+If you want social proof, use:
+- Trust badges
+- Certifications
+- Years of experience
+- General statistics (if verified achievements are provided)
+"""
+
+    # Add verified achievements if available
+    if brand_content.achievements_json:
+        verified_content_instruction += f"""
+
+VERIFIED ACHIEVEMENTS (Use these for social proof):
+{brand_content.achievements_json}
+"""
+
+    # Add verified services if available
+    if brand_content.services_json:  # Limited to the first 5
+        verified_content_instruction += f"""
+
+VERIFIED SERVICES (Reference these):
+{brand_content.services_json}
+"""
+
+    # Add founder info if available
+    founder_info = ""
+    if brand.founder is not None:
+        founder_info = f"\n- Founder: {brand.founder}"
+    if brand.tagline is not None:
+        founder_info += (f"\n- Tagline: {brand.tagline} "
+                         "(use this in appropriate places like footer or about section)")
+
+    # Add credentials if available
+    credentials_info = ""
+    if brand.credentials_json:
+        credentials_info = f"""
+
+CREDENTIALS & QUALIFICATIONS (Display prominently for trust):
+{brand.credentials_json}
+
+- Include success rate, years of experience, total clients/approvals prominently
+- For attorneys: Display bar number, certifications, specializations
+- Build credibility through specific numbers and verifiable credentials
+"""
+
+    # Add trust badges
+    trust_badges_info = ""
+    if brand.trust_badges_json:
+        trust_badges_info = f"""
+
+TRUST BADGES (Display near hero section):
+{brand.trust_badges_json}
+
+- Create a visually appealing trust badge section near the top of the page
+- Use icons and clear text
+- Make badges stand out with brand colors
+"""
+
+    # Add FAQs from verified content
+    faq_info = ""
+    if brand_content.faqs_json:
+        faq_info = f"""
+
+FAQ SECTION (REQUIRED - Address objections):
+{brand_content.faqs_json}
+
+- Create an FAQ section before the final CTA
+- Use accordion/collapsible design for clean presentation
+- These FAQs address real customer objections - include all of them
+"""
+
+    # Add press mentions if available
+    press_mentions_info = ""
+    if brand_content.press_mentions_json:
+        press_mentions_info = f"""
+
+PRESS MENTIONS (As Seen In section):
+{brand_content.press_mentions_json}
+
+- Create an "As Seen In" or "Featured In" section
+- Display outlet names prominently
+- Link to articles if URLs provided
+"""
+
+    # Add eligibility quiz if available
+    eligibility_quiz_info = ""
+    if brand_content.eligibility_quiz_json:
+        eligibility_quiz_info = f"""
+
+⚠️ REQUIRED: INTERACTIVE ELIGIBILITY QUIZ (High-Converting Lead Generator)
+{brand_content.eligibility_quiz_json}
+
+- Create a full-page or modal eligibility quiz with JavaScript
+- Multi-step progress indicator (Question X of Y)
+- Each question on its own screen/step
+- Previous/Next navigation buttons
+- Email capture before showing results
+- Calculate score based on answers (stronger answers = higher scores)
+- Show personalized results based on score thresholds
+- Include CTA to book consultation in results
+- Mobile-friendly design with smooth transitions
+- This typically converts at 20-40% - make it prominent!
+
+Scoring guide:
+- International competition: 5 points
+- Extensive media: 4 points
+- Major awards: 5 points
+- Professional goals: 3 points
+"""
+
+    # Add video testimonials if available
+    video_testimonials_info = ""
+    if brand_content.video_testimonials_json:
+        video_testimonials_info = f"""
+
+VIDEO TESTIMONIALS (3x More Trust Than Text):
+{brand_content.video_testimonials_json}
+
+- Embed YouTube/Vimeo videos using provided URLs
+- Display video thumbnail with play button overlay
+- Show author name and title below video
+- Include short quote preview as caption
+- Make videos responsive (16:9 aspect ratio)
+- Add "Watch [Client Name]'s Story" headline
+- Video testimonials are MUCH more powerful than text - feature them prominently
+"""
+
+    # Add live chat widget
+    live_chat_info = ""
+    if brand.live_chat_enabled:
+        live_chat_info = f"""
+
+LIVE CHAT WIDGET (Increases Conversions by 38%):
+{brand.live_chat_json}
+
+- Add a chat widget button fixed to bottom-right corner
+- Show availability status: "{brand.live_chat.get('availability_text', 'Chat with us')}"
+- Use brand colors for chat button
+- Bubble icon with notification dot
+- On click: open chat interface (simulate - can say "Chat opens in Intercom")
+- Display offline message when outside business hours
+- Make it unobtrusive but always visible
+"""
+
+    # Add multi-step form
+    multi_step_form_info = ""
+    if brand.multi_step_form:
+        multi_step_form_info = f"""
+
+MULTI-STEP LEAD FORM (Higher Completion Rates):
+{brand.lead_form_json}
+
+- Create a multi-step form with progress indicator
+- Show one step at a time with smooth transitions
+- Progress bar showing "Step X of Y"
+- Back/Next buttons for navigation
+- Validate each step before proceeding
+- Final step includes submit button
+- Use brand colors for progress indicators
+- Make it mobile-responsive
+- Multi-step forms have 30-50% higher completion rates than single-page forms
+"""
+
+    # Add dynamic pricing
+    dynamic_pricing_info = ""
+    if brand_content.pricing_json:
+        dynamic_pricing_info = f"""
+
+DYNAMIC PRICING DISPLAY:
+{brand_content.pricing_json}
+
+- Show pricing tiers after quiz completion
+- Display recommended tier based on quiz score:
+  * "strong" → Recommend Premium Package
+  * "moderate" → Recommend Standard Package
+  * "weak" → Recommend Consultation Only
+- Highlight "popular" tier with badge
+- Show discount badge: "{brand_content.pricing.get('discount_badge', '')}"
+- Include feature lists for each tier
+- Add CTA buttons with tier-specific text
+- Use pricing cards with brand colors
+- Make it look professional and trustworthy
+"""
+
+    return BrandPromptFragments(
+        verified_content=verified_content_instruction,
+        founder=founder_info,
+        credentials=credentials_info,
+        trust_badges=trust_badges_info,
+        faq=faq_info,
+        press_mentions=press_mentions_info,
+        eligibility_quiz=eligibility_quiz_info,
+        video_testimonials=video_testimonials_info,
+        live_chat=live_chat_info,
+        multi_step_form=multi_step_form_info,
+        pricing=dynamic_pricing_info
+    )
+
+
+class PromptFragmentCache:
+    """
+    Brand prompt fragments keyed on the identity of the Brand and VerifiedContent they were built
+    from. A reload of brands.json or of the brand's shard publishes new objects, so the key is
+    always consistent with the data being rendered, without reading a version counter that may
+    have moved on since the load. Entries hold on to their objects, so an id cannot be reused
+    while it is cached. Old entries age out least recently used first.
+    """
+
+    def __init__(self, max_entries=64):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()  # key -> (brand, brand_content, fragments)
+        self._lock = threading.Lock()
+
+    def get(self, brand, brand_content):
+        key = (brand.id, id(brand), id(brand_content))
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                return entry[2]
+
+        fragments = build_brand_fragments(brand, brand_content)
+        with self._lock:
+            self._entries[key] = (brand, brand_content, fragments)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return fragments
+
+
+# Marks the end of a prompt prefix the API may cache and reuse across calls
+CACHE_CONTROL = {"type": "ephemeral"}
+
+# Generation is stopped here; anything the model would add after the page is discarded anyway
+END_OF_DOCUMENT = "</html>"
+
+# Stands in for the hero image URL while the image is still being generated
+HERO_IMAGE_PLACEHOLDER = "{{HERO_IMAGE_URL}}"
+
+LANDING_PAGE_REQUIREMENTS = """REQUIREMENTS:
+1. Fully responsive design (mobile-first)
+2. Modern, professional aesthetic matching the DESIGN STYLE given below
+3. Use brand colors throughout
+4. Include logo in header
+5. Clear visual hierarchy
+6. Fast loading (inline all CSS/JS)
+7. Semantic HTML5
+8. Accessibility best practices
+9. Clear, compelling copy
+10. Strong call-to-action buttons with brand colors
+
+For Assessment-Driven Funnel philosophy, include:
+- Compelling hook (frustration or readiness based)
+- Subheading explaining the 15-question assessment
+- Value proposition about measuring 3 key areas
+- Credibility section
+- Prominent CTA to start the assessment"""
+
+
+def cta_lines(cta):
+    secondary_line = ""
+    if 'secondary' in cta:
+        secondary = cta['secondary']
+        secondary_line = f"- Secondary: {secondary.get('text', '')} → {secondary.get('url', '')}"
+    return f"""- Primary: {cta['primary']['text']} → {cta['primary']['url']}
+{secondary_line}"""
+
+
+def landing_page_prefix(brand, fragments, philosophy, philosophy_json):
+    """
+    The part of the landing page prompt that depends only on the brand, its verified content and
+    the philosophy. It is byte-identical for every session generating that combination, so the
+    API can serve it from the prompt cache.
+    """
+    return f"""Create a complete, production-ready HTML landing page with inline CSS and JavaScript.
+{fragments.verified_content}
+{fragments.credentials}
+{fragments.trust_badges}
+{fragments.faq}
+{fragments.press_mentions}
+{fragments.eligibility_quiz}
+{fragments.video_testimonials}
+{fragments.live_chat}
+{fragments.multi_step_form}
+{fragments.pricing}
+
+BRAND INFORMATION:
+- Brand Name: {brand.name}
+- Logo URL: {brand.logo}
+- Website: {brand.website}{fragments.founder}
+
+PHILOSOPHY: {philosophy}
+{philosophy_json}
+
+{LANDING_PAGE_REQUIREMENTS}"""
+
+
+def landing_page_session(colors, style, cta, intent, copy_preview=None, hero_image_url=None,
+                         integrations=None):
+    """The choices made in this session; shared by every variation and regeneration of the page"""
+    copy_guidance = ""
+    if copy_preview:
+        copy_guidance = f"""
+APPROVED COPY OUTLINE:
+{copy_preview}
+
+Use this approved copy as the foundation for your HTML content.
+"""
+
+    # Add hero image if generated
+    hero_image_instruction = ""
+    if hero_image_url:
+        hero_image_instruction = f"""
+HERO IMAGE (REQUIRED):
+- Use this AI-generated image as the main hero image: {hero_image_url}
+- Place it prominently in the hero section
+- Use proper <img> tag with alt text describing the image
+- Make it responsive and visually impactful
+"""
+        if hero_image_url == HERO_IMAGE_PLACEHOLDER:
+            hero_image_instruction += (
+                f"- {HERO_IMAGE_PLACEHOLDER} is replaced with the real image URL after generation; "
+                f"write it exactly as given, e.g. <img src=\"{HERO_IMAGE_PLACEHOLDER}\" ...>\n"
+            )
+
+    # Add calendar integration (from session_state integrations)
+    calendar_integration_info = ""
+    if integrations and integrations.get('calendly_url'):
+        calendar_integration_info = f"""
+
+CALENDAR INTEGRATION (Instant Booking):
+- Calendly URL: {integrations.get('calendly_url')}
+
+- Embed Calendly booking widget
+- Inline embed OR modal popup button
+- Button text: "Schedule Free Consultation"
+- Modal title: "Book Your Free Consultation"
+- Use brand colors for calendar button
+- Make it prominent - calendar booking converts at 15-30%
+- Place calendar CTA after quiz results or in hero section
+"""
+
+    # Add email automation (from session_state integrations)
+    email_automation_info = ""
+    if integrations and integrations.get('n8n_webhook'):
+        email_automation_info = f"""
+
+EMAIL AUTOMATION (n8n Webhook Integration):
+- Webhook URL: {integrations.get('n8n_webhook')}
+
+- Add hidden form fields for webhook submission
+- On quiz completion: POST results to webhook URL
+- On form submission: POST data to webhook URL
+- Include JavaScript to handle webhook POST requests
+- Fields to send: name, email, phone, quiz_score, quiz_result
+- Auto-send quiz results email via webhook
+- Notify admin of new leads via n8n workflow
+"""
+
+    # Add CRM integration (from session_state integrations)
+    crm_integration_info = ""
+    if integrations and integrations.get('ghl_webhook'):
+        crm_integration_info = f"""
+
+CRM INTEGRATION (GOHIGHLEVEL):
+- Webhook URL: {integrations.get('ghl_webhook')}
+
+- Sync leads to GoHighLevel CRM automatically
+- POST quiz results to webhook URL above
+- Send fields: email, name, phone, company, quiz_score, result_tier
+- Include JavaScript for CRM API calls
+- Add hidden form for CRM submission
+- Track lead source as "Landing Page - [Brand Name]"
+"""
+
+    # Add heatmap tracking (from session_state integrations)
+    heatmap_tracking_info = ""
+    if integrations and integrations.get('clarity_project_id'):
+        project_id = integrations.get('clarity_project_id')
+        heatmap_tracking_info = f"""
+
+HEATMAP TRACKING (Microsoft Clarity):
+- Project ID: {project_id}
+
+- Add Microsoft Clarity tracking code to <head>
+- Tracking code:
+<script type="text/javascript">
+    (function(c,l,a,r,i,t,y){{
+        c[a]=c[a]||function(){{(c[a].q=c[a].q||[]).push(arguments)}};
+        t=l.createElement(r);t.async=1;t.src="https://www.clarity.ms/tag/"+i;
+        y=l.getElementsByTagName(r)[0];y.parentNode.insertBefore(t,y);
+    }})(window, document, "clarity", "script", "{project_id}");
+</script>
+- Tracks: clicks, scrolls, sessions, heatmaps, session recordings
+"""
+
+    return f"""{copy_guidance}
+{hero_image_instruction}
+{calendar_integration_info}
+{email_automation_info}
+{crm_integration_info}
+{heatmap_tracking_info}
+
+BRAND COLORS:
+- Primary Color: {colors['primary']}
+- Secondary Color: {colors['secondary']}
+- Accent Color: {colors['accent']}
+
+DESIGN STYLE: {style}
+
+CALL-TO-ACTION:
+{cta_lines(cta)}
+
+USER GOAL/INTENT:
+{intent}"""
+
+
+def landing_page_suffix(feedback=None):
+    """The per-call instructions that follow the cached prefix"""
+    suffix = ""
+    if feedback:
+        suffix = f"""USER FEEDBACK/ADJUSTMENTS:
+{feedback}
+
+Please incorporate this feedback into the final HTML.
+
+"""
+    return suffix + "Return ONLY the complete HTML code, no explanations or markdown formatting."
+
+
+# Copy angles for multivariate tests. Each variation sends its directive as the per-call feedback,
+# so all of them share the cached brand, philosophy and session layers of the prompt.
+VARIANT_ANGLES = {
+    'pain': {
+        "label": "Pain Points",
+        "directive": ("Create a DIFFERENT approach: Focus on pain points and what they're losing "
+                      "by not taking action. Use more emotional triggers.")
+    },
+    'aspiration': {
+        "label": "Aspiration",
+        "directive": ("Create a DIFFERENT approach: Focus on the future they want. Paint a vivid "
+                      "picture of life after success and lead with the outcome, not the process.")
+    },
+    'authority': {
+        "label": "Authority",
+        "directive": ("Create a DIFFERENT approach: Lead with expertise and credibility. Put "
+                      "credentials, track record, press mentions and trust badges first and use a "
+                      "confident, expert tone.")
+    },
+    'urgency': {
+        "label": "Urgency",
+        "directive": ("Create a DIFFERENT approach: Focus on urgency and the cost of waiting. Use "
+                      "deadlines, limited availability and scarcity, and make every CTA "
+                      "time-sensitive.")
+    },
+    'social_proof': {
+        "label": "Social Proof",
+        "directive": ("Create a DIFFERENT approach: Lead with social proof. Put testimonials, "
+                      "client results and numbers of people helped above the fold and throughout "
+                      "the page.")
+    }
+}
+
+
+def copy_preview_prefix(brand, philosophy, philosophy_json):
+    """The brand and philosophy part of the copy outline prompt; cached like landing_page_prefix"""
+    return f"""Generate a detailed content outline for a landing page. \
+DO NOT write HTML - just the copy and content structure.
+
+BRAND INFORMATION:
+- Brand Name: {brand.name}
+- Primary Color: {brand.colors.primary}
+- Website: {brand.website}
+
+PHILOSOPHY: {philosophy}
+{philosophy_json}
+
+Please provide:
+1. **Page Title** - The main headline (H1)
+2. **Subheadline** - Supporting text under the headline
+3. **Section Breakdown** - List each section with:
+   - Section title
+   - Key message/copy
+   - Purpose
+4. **Key Benefits** - 3-5 bullet points
+5. **Meta Description** - For SEO (150-160 characters)
+6. **Meta Title** - For browser tab (50-60 characters)"""
+
+
+def copy_preview_suffix(style, cta, intent):
+    return f"""DESIGN STYLE: {style}
+
+CALL-TO-ACTION:
+{cta_lines(cta)}
+
+USER GOAL/INTENT:
+{intent}
+
+Format as clear, structured text that I can review and approve before HTML generation."""
+
+
+def cached_messages(prefix, *blocks):
+    """
+    System prompt and user message for the Messages API with a cache breakpoint after the prefix
+    and after every block but the last, so each stable layer can be reused by later calls
+    """
+    system = [{"type": "text", "text": prefix, "cache_control": CACHE_CONTROL}]
+    content = [{"type": "text", "text": block} for block in blocks if block]
+    for block in content[:-1]:
+        block["cache_control"] = CACHE_CONTROL
+    return system, [{"role": "user", "content": content}]
+
+
+def clean_html_output(text):
+    """The page from a landing page response: markdown fences and anything after </html> removed"""
+    if '```html' in text:
+        text = text.split('```html')[1].split('```')[0]
+    elif '```' in text:
+        text = text.split('```')[1].split('```')[0]
+
+    end = text.find(END_OF_DOCUMENT)
+    if end != -1:
+        text = text[:end + len(END_OF_DOCUMENT)]
+    return text.strip()
+
+
+def gradient_hero_image(colors):
+    """Data URI gradient in the page's primary and secondary colors, used without a hero image"""
+    svg = f"""<svg xmlns="http://www.w3.org/2000/svg" width="1792" height="1024" \
+viewBox="0 0 1792 1024" preserveAspectRatio="none">
+<defs><linearGradient id="hero" x1="0" y1="0" x2="1" y2="1">
+<stop offset="0" stop-color="{colors['primary']}"/>\
+<stop offset="1" stop-color="{colors['secondary']}"/>
+</linearGradient></defs>
+<rect width="100%" height="100%" fill="url(#hero)"/>
+</svg>"""
+    return f"data:image/svg+xml;base64,{base64.b64encode(svg.encode()).decode()}"
+
+
+def substitute_hero_image(html, image_url, colors):
+    """Put the hero image URL in place of the placeholder, or the gradient if the image failed"""
+    if HERO_IMAGE_PLACEHOLDER not in html:
+        return html
+    return html.replace(HERO_IMAGE_PLACEHOLDER, image_url or gradient_hero_image(colors))
@@ -8,6 +8,14 @@ import os
 import zipfile
 import io
 import base64
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+from config_loader import ConfigError, ConfigLoader, get_contrast_text_color
+from content_store import EMPTY_CONTENT, VerifiedContentStore
+from prompts import (END_OF_DOCUMENT, HERO_IMAGE_PLACEHOLDER, VARIANT_ANGLES, PromptFragmentCache,
+                     cached_messages, clean_html_output, copy_preview_prefix, copy_preview_suffix,
+                     landing_page_prefix, landing_page_session, landing_page_suffix, substitute_hero_image)
 
 # ============================================================================
 # PAGE CONFIG
@@ -60,45 +68,98 @@ if 'style_selected' not in st.session_state:
     st.session_state.style_selected = False
 if 'ab_testing' not in st.session_state:
     st.session_state.ab_testing = False
-if 'variation_b' not in st.session_state:
-    st.session_state.variation_b = None
+if 'variant_angles' not in st.session_state:
+    st.session_state.variant_angles = ['pain']
+if 'variants' not in st.session_state:
+    st.session_state.variants = {}  # Test variation HTML by angle; the control page stays in html
+if 'variant_stats' not in st.session_state:
+    st.session_state.variant_stats = {}
+if 'deployed_urls' not in st.session_state:
+    st.session_state.deployed_urls = {}
 
 # ============================================================================
 # HELPER FUNCTIONS
 # ============================================================================
 
-@st.cache_data
+@st.cache_resource
+def get_config_loader():
+    """One config loader per server process; it re-parses a config file only when it changes on disk"""
+    return ConfigLoader()
+
 def load_brands():
     """Load brand configurations from JSON"""
     try:
-        with open('config/brands.json', 'r') as f:
-            return json.load(f)
+        return get_config_loader().brands()
     except FileNotFoundError:
         st.error("brands.json not found. Please ensure config/brands.json exists.")
         return {}
+    except (json.JSONDecodeError, ConfigError) as e:
+        st.error(f"❌ Invalid brands.json: {e}")
+        return {}
 
-@st.cache_data
 def load_philosophy():
     """Load philosophy configurations from JSON"""
     try:
-        with open('config/philosophy.json', 'r') as f:
-            return json.load(f)
+        return get_config_loader().philosophy()
     except FileNotFoundError:
         st.error("philosophy.json not found. Please ensure config/philosophy.json exists.")
         return {}
+    except (json.JSONDecodeError, ConfigError) as e:
+        st.error(f"❌ Invalid philosophy.json: {e}")
+        return {}
+
+@st.cache_resource
+def get_verified_content_store():
+    """One shard store per server process, so its mtime cache survives reruns and sessions"""
+    return VerifiedContentStore()
 
-@st.cache_data(ttl=3600)  # Cache for 1 hour
-def load_verified_content():
-    """Load verified content from crawled websites"""
+def load_verified_content(brand_id):
+    """Load one brand's verified content from crawled websites"""
     try:
-        with open('config/verified_content.json', 'r') as f:
-            return json.load(f)
-    except FileNotFoundError:
-        st.warning("⚠️ verified_content.json not found. Run `python3 crawl_websites.py` to extract real testimonials.")
-        return {}
-    except json.JSONDecodeError as e:
-        st.error(f"❌ Error parsing verified_content.json: {e}")
-        return {}
+        content = get_verified_content_store().get(brand_id)
+    except (json.JSONDecodeError, ConfigError) as e:
+        st.error(f"❌ Error parsing verified content for {brand_id}: {e}")
+        return EMPTY_CONTENT
+    if not content:
+        st.warning(f"⚠️ No verified content for {brand_id}. Run `python3 crawl_websites.py` to extract real testimonials.")
+    return content
+
+@st.cache_resource
+def get_prompt_fragment_cache():
+    """Brand prompt sections shared by every session on this server"""
+    return PromptFragmentCache()
+
+def get_prompt_fragments(brand, brand_content):
+    """The brand's prompt sections for exactly the brand config and verified content passed in"""
+    return get_prompt_fragment_cache().get(brand, brand_content)
+
+def record_prompt_cache_usage(call, usage):
+    """Keep each call's token usage, including prompt cache reads and writes, for display in step 10"""
+    if usage is None:
+        return
+    if 'prompt_cache_usage' not in st.session_state:
+        st.session_state.prompt_cache_usage = []
+    st.session_state.prompt_cache_usage.append({
+        "call": call,
+        "input_tokens": usage.input_tokens,
+        "cache_read_input_tokens": getattr(usage, 'cache_read_input_tokens', None) or 0,
+        "cache_creation_input_tokens": getattr(usage, 'cache_creation_input_tokens', None) or 0,
+        "output_tokens": usage.output_tokens
+    })
+
+# Claude Sonnet 4 prices in USD per million tokens
+MODEL_PRICES = {"input": 3.00, "cache_write": 3.75, "cache_read": 0.30, "output": 15.00}
+
+def usage_cost(usage):
+    """Estimated USD cost of one call from its token usage"""
+    if usage is None:
+        return 0.0
+    return (
+        usage.input_tokens * MODEL_PRICES["input"]
+        + (getattr(usage, 'cache_creation_input_tokens', None) or 0) * MODEL_PRICES["cache_write"]
+        + (getattr(usage, 'cache_read_input_tokens', None) or 0) * MODEL_PRICES["cache_read"]
+        + usage.output_tokens * MODEL_PRICES["output"]
+    ) / 1_000_000
 
 def get_secret(key):
     """Get secret from Streamlit secrets or environment variable"""
@@ -118,20 +179,6 @@ def is_valid_url(url):
     pattern = re.compile(r'^https?://.+')
     return bool(pattern.match(url))
 
-def get_contrast_text_color(hex_color):
-    """Return black or white text color based on background luminance"""
-    try:
-        # Remove # if present
-        hex_color = hex_color.lstrip('#')
-        # Convert to RGB
-        r, g, b = int(hex_color[0:2], 16), int(hex_color[2:4], 16), int(hex_color[4:6], 16)
-        # Calculate relative luminance
-        luminance = (0.299 * r + 0.587 * g + 0.114 * b) / 255
-        # Return black for light backgrounds, white for dark
-        return '#000000' if luminance > 0.5 else '#FFFFFF'
-    except:
-        return '#FFFFFF'  # Default to white if error
-
 def check_color_accessibility(bg_color, text_color='#FFFFFF'):
     """Check WCAG contrast ratio between background and text colors"""
     try:
@@ -205,501 +252,290 @@ def generate_copy_preview(brand, philosophy, style, cta, intent):
         client = Anthropic(api_key=api_key)
 
         # Load philosophy details
-        phil_data = load_philosophy()
-        phil_info = phil_data.get(philosophy, {})
-
-        prompt = f"""Generate a detailed content outline for a landing page. DO NOT write HTML - just the copy and content structure.
-
-BRAND INFORMATION:
-- Brand Name: {brand['name']}
-- Primary Color: {brand['colors']['primary']}
-- Website: {brand['website']}
-
-PHILOSOPHY: {philosophy}
-{json.dumps(phil_info, indent=2)}
-
-DESIGN STYLE: {style}
-
-CALL-TO-ACTION:
-- Primary: {cta['primary']['text']} → {cta['primary']['url']}
-{'- Secondary: ' + cta.get('secondary', {}).get('text', '') + ' → ' + cta.get('secondary', {}).get('url', '') if 'secondary' in cta else ''}
-
-USER GOAL/INTENT:
-{intent}
+        phil_info = load_philosophy().get(philosophy)
+        phil_json = phil_info.prompt_json if phil_info else "{}"
 
-Please provide:
-1. **Page Title** - The main headline (H1)
-2. **Subheadline** - Supporting text under the headline
-3. **Section Breakdown** - List each section with:
-   - Section title
-   - Key message/copy
-   - Purpose
-4. **Key Benefits** - 3-5 bullet points
-5. **Meta Description** - For SEO (150-160 characters)
-6. **Meta Title** - For browser tab (50-60 characters)
-
-Format as clear, structured text that I can review and approve before HTML generation."""
+        system, messages = cached_messages(
+            copy_preview_prefix(brand, philosophy, phil_json),
+            copy_preview_suffix(style, cta, intent)
+        )
 
         response = client.messages.create(
             model="claude-sonnet-4-20250514",
             max_tokens=2000,
-            messages=[{"role": "user", "content": prompt}]
+            system=system,
+            messages=messages
         )
+        record_prompt_cache_usage('copy_preview', response.usage)
 
         return response.content[0].text
     except Exception as e:
         st.error(f"Error generating copy preview: {str(e)}")
         return None
 
-def generate_landing_page(brand, philosophy, style, cta, intent, copy_preview=None, feedback=None, hero_image_url=None, brand_id=None, integrations=None):
-    """Generate landing page HTML using Claude API"""
-    try:
-        api_key = get_secret('ANTHROPIC_API_KEY')
-        if not api_key:
-            st.error("ANTHROPIC_API_KEY not set in secrets or environment")
-            return "<html><body><h1>Error: API key missing</h1></body></html>"
+def landing_page_messages(brand, philosophy, style, cta, intent, copy_preview=None, feedback=None, hero_image_url=None, brand_id=None, integrations=None):
+    """System prompt and messages for a landing page; reads configs and session state, so call it on the script thread"""
+    # Pick up brands.json edits made since the brand was selected
+    brand = load_brands().get(brand.id, brand)
 
-        client = Anthropic(api_key=api_key)
+    # Load philosophy details
+    phil_info = load_philosophy().get(philosophy)
+    phil_json = phil_info.prompt_json if phil_info else "{}"
 
-        # Load philosophy details
-        phil_data = load_philosophy()
-        phil_info = phil_data.get(philosophy, {})
-
-        # Load verified content for this brand
-        verified_content = load_verified_content()
-        brand_content = verified_content.get(brand_id, {}) if brand_id else {}
-
-        # Build copy guidance section
-        copy_guidance = ""
-        if copy_preview:
-            copy_guidance = f"""
-APPROVED COPY OUTLINE:
-{copy_preview}
-
-Use this approved copy as the foundation for your HTML content.
-"""
-
-        if feedback:
-            copy_guidance += f"""
-USER FEEDBACK/ADJUSTMENTS:
-{feedback}
-
-Please incorporate this feedback into the final HTML.
-"""
-
-        # Add hero image if generated
-        hero_image_instruction = ""
-        if hero_image_url:
-            hero_image_instruction = f"""
-HERO IMAGE (REQUIRED):
-- Use this AI-generated image as the main hero image: {hero_image_url}
-- Place it prominently in the hero section
-- Use proper <img> tag with alt text describing the image
-- Make it responsive and visually impactful
-"""
-
-        # Add verified content instructions
-        verified_content_instruction = """
-⚠️ CRITICAL TESTIMONIAL POLICY:
-"""
-
-        # Check if testimonials are available
-        has_testimonials = brand_content.get('testimonials') and len(brand_content.get('testimonials', [])) > 0
-        allow_ai_testimonials = brand_content.get('allow_ai_testimonials', False)
-
-        if has_testimonials:
-            testimonials_json = json.dumps(brand_content['testimonials'], indent=2)
-            verified_content_instruction += f"""
-VERIFIED TESTIMONIALS (Use ONLY these):
-{testimonials_json}
-
-- You MUST use ONLY these verified testimonials
-- DO NOT modify or paraphrase these testimonials
-- Include attribution exactly as provided
-- You may use fewer testimonials, but NEVER create fake ones
-"""
-        else:
-            verified_content_instruction += """
-NO VERIFIED TESTIMONIALS AVAILABLE.
-
-⛔ DO NOT CREATE, FABRICATE, OR MAKE UP ANY TESTIMONIALS
-⛔ DO NOT include a testimonials section if no verified testimonials exist
-⛔ DO NOT use placeholder testimonials
-⛔ DO NOT paraphrase or invent customer quotes
-
-If you want social proof, use:
-- Trust badges
-- Certifications
-- Years of experience
-- General statistics (if verified achievements are provided)
-"""
-
-        # Add verified achievements if available
-        if brand_content.get('achievements'):
-            achievements_json = json.dumps(brand_content['achievements'], indent=2)
-            verified_content_instruction += f"""
-
-VERIFIED ACHIEVEMENTS (Use these for social proof):
-{achievements_json}
-"""
-
-        # Add verified services if available
-        if brand_content.get('services'):
-            services_json = json.dumps(brand_content['services'][:5], indent=2)  # Limit to 5
-            verified_content_instruction += f"""
-
-VERIFIED SERVICES (Reference these):
-{services_json}
-"""
-
-        # Add founder info if available
-        founder_info = ""
-        if 'founder' in brand:
-            founder_info = f"\n- Founder: {brand['founder']}"
-        if 'tagline' in brand:
-            founder_info += f"\n- Tagline: {brand['tagline']} (use this in appropriate places like footer or about section)"
-
-        # Add credentials if available
-        credentials_info = ""
-        if 'credentials' in brand:
-            credentials_json = json.dumps(brand['credentials'], indent=2)
-            credentials_info = f"""
-
-CREDENTIALS & QUALIFICATIONS (Display prominently for trust):
-{credentials_json}
-
-- Include success rate, years of experience, total clients/approvals prominently
-- For attorneys: Display bar number, certifications, specializations
-- Build credibility through specific numbers and verifiable credentials
-"""
-
-        # Add trust badges
-        trust_badges_info = ""
-        if 'trust_badges' in brand:
-            trust_badges_json = json.dumps(brand['trust_badges'], indent=2)
-            trust_badges_info = f"""
-
-TRUST BADGES (Display near hero section):
-{trust_badges_json}
-
-- Create a visually appealing trust badge section near the top of the page
-- Use icons and clear text
-- Make badges stand out with brand colors
-"""
-
-        # Add FAQs from verified content
-        faq_info = ""
-        if brand_content.get('faqs'):
-            faqs_json = json.dumps(brand_content['faqs'], indent=2)
-            faq_info = f"""
-
-FAQ SECTION (REQUIRED - Address objections):
-{faqs_json}
-
-- Create an FAQ section before the final CTA
-- Use accordion/collapsible design for clean presentation
-- These FAQs address real customer objections - include all of them
-"""
-
-        # Add press mentions if available
-        press_mentions_info = ""
-        if brand_content.get('press_mentions') and len(brand_content['press_mentions']) > 0:
-            press_json = json.dumps(brand_content['press_mentions'], indent=2)
-            press_mentions_info = f"""
-
-PRESS MENTIONS (As Seen In section):
-{press_json}
-
-- Create an "As Seen In" or "Featured In" section
-- Display outlet names prominently
-- Link to articles if URLs provided
-"""
-
-        # Add eligibility quiz if available
-        eligibility_quiz_info = ""
-        if brand_content.get('eligibility_quiz', {}).get('enabled'):
-            quiz_data = json.dumps(brand_content['eligibility_quiz'], indent=2)
-            eligibility_quiz_info = f"""
-
-⚠️ REQUIRED: INTERACTIVE ELIGIBILITY QUIZ (High-Converting Lead Generator)
-{quiz_data}
-
-- Create a full-page or modal eligibility quiz with JavaScript
-- Multi-step progress indicator (Question X of Y)
-- Each question on its own screen/step
-- Previous/Next navigation buttons
-- Email capture before showing results
-- Calculate score based on answers (stronger answers = higher scores)
-- Show personalized results based on score thresholds
-- Include CTA to book consultation in results
-- Mobile-friendly design with smooth transitions
-- This typically converts at 20-40% - make it prominent!
-
-Scoring guide:
-- International competition: 5 points
-- Extensive media: 4 points
-- Major awards: 5 points
-- Professional goals: 3 points
-"""
-
-        # Add video testimonials if available
-        video_testimonials_info = ""
-        if brand_content.get('video_testimonials') and len(brand_content['video_testimonials']) > 0:
-            video_json = json.dumps(brand_content['video_testimonials'], indent=2)
-            video_testimonials_info = f"""
-
-VIDEO TESTIMONIALS (3x More Trust Than Text):
-{video_json}
-
-- Embed YouTube/Vimeo videos using provided URLs
-- Display video thumbnail with play button overlay
-- Show author name and title below video
-- Include short quote preview as caption
-- Make videos responsive (16:9 aspect ratio)
-- Add "Watch [Client Name]'s Story" headline
-- Video testimonials are MUCH more powerful than text - feature them prominently
-"""
-
-        # Add live chat widget
-        live_chat_info = ""
-        if brand.get('live_chat', {}).get('enabled'):
-            chat_data = json.dumps(brand['live_chat'], indent=2)
-            live_chat_info = f"""
-
-LIVE CHAT WIDGET (Increases Conversions by 38%):
-{chat_data}
-
-- Add a chat widget button fixed to bottom-right corner
-- Show availability status: "{brand['live_chat'].get('availability_text', 'Chat with us')}"
-- Use brand colors for chat button
-- Bubble icon with notification dot
-- On click: open chat interface (simulate - can say "Chat opens in Intercom")
-- Display offline message when outside business hours
-- Make it unobtrusive but always visible
-"""
-
-        # Add multi-step form
-        multi_step_form_info = ""
-        if brand.get('lead_form', {}).get('type') == 'multi-step':
-            form_data = json.dumps(brand['lead_form'], indent=2)
-            multi_step_form_info = f"""
-
-MULTI-STEP LEAD FORM (Higher Completion Rates):
-{form_data}
-
-- Create a multi-step form with progress indicator
-- Show one step at a time with smooth transitions
-- Progress bar showing "Step X of Y"
-- Back/Next buttons for navigation
-- Validate each step before proceeding
-- Final step includes submit button
-- Use brand colors for progress indicators
-- Make it mobile-responsive
-- Multi-step forms have 30-50% higher completion rates than single-page forms
-"""
-
-        # Add calendar integration (from session_state integrations)
-        calendar_integration_info = ""
-        if integrations and integrations.get('calendly_url'):
-            calendar_integration_info = f"""
-
-CALENDAR INTEGRATION (Instant Booking):
-- Calendly URL: {integrations.get('calendly_url')}
-
-- Embed Calendly booking widget
-- Inline embed OR modal popup button
-- Button text: "Schedule Free Consultation"
-- Modal title: "Book Your Free Consultation"
-- Use brand colors for calendar button
-- Make it prominent - calendar booking converts at 15-30%
-- Place calendar CTA after quiz results or in hero section
-"""
-
-        # Add email automation (from session_state integrations)
-        email_automation_info = ""
-        if integrations and integrations.get('n8n_webhook'):
-            email_automation_info = f"""
-
-EMAIL AUTOMATION (n8n Webhook Integration):
-- Webhook URL: {integrations.get('n8n_webhook')}
-
-- Add hidden form fields for webhook submission
-- On quiz completion: POST results to webhook URL
-- On form submission: POST data to webhook URL
-- Include JavaScript to handle webhook POST requests
-- Fields to send: name, email, phone, quiz_score, quiz_result
-- Auto-send quiz results email via webhook
-- Notify admin of new leads via n8n workflow
-"""
-
-        # Add CRM integration (from session_state integrations)
-        crm_integration_info = ""
-        if integrations and integrations.get('ghl_webhook'):
-            crm_integration_info = f"""
-
-CRM INTEGRATION (GOHIGHLEVEL):
-- Webhook URL: {integrations.get('ghl_webhook')}
-
-- Sync leads to GoHighLevel CRM automatically
-- POST quiz results to webhook URL above
-- Send fields: email, name, phone, company, quiz_score, result_tier
-- Include JavaScript for CRM API calls
-- Add hidden form for CRM submission
-- Track lead source as "Landing Page - [Brand Name]"
-"""
-
-        # Add heatmap tracking (from session_state integrations)
-        heatmap_tracking_info = ""
-        if integrations and integrations.get('clarity_project_id'):
-            project_id = integrations.get('clarity_project_id')
-            heatmap_tracking_info = f"""
-
-HEATMAP TRACKING (Microsoft Clarity):
-- Project ID: {project_id}
-
-- Add Microsoft Clarity tracking code to <head>
-- Tracking code:
-<script type="text/javascript">
-    (function(c,l,a,r,i,t,y){{
-        c[a]=c[a]||function(){{(c[a].q=c[a].q||[]).push(arguments)}};
-        t=l.createElement(r);t.async=1;t.src="https://www.clarity.ms/tag/"+i;
-        y=l.getElementsByTagName(r)[0];y.parentNode.insertBefore(t,y);
-    }})(window, document, "clarity", "script", "{project_id}");
-</script>
-- Tracks: clicks, scrolls, sessions, heatmaps, session recordings
-"""
-
-        # Add dynamic pricing
-        dynamic_pricing_info = ""
-        if brand_content.get('pricing'):
-            pricing_data = json.dumps(brand_content['pricing'], indent=2)
-            dynamic_pricing_info = f"""
-
-DYNAMIC PRICING DISPLAY:
-{pricing_data}
-
-- Show pricing tiers after quiz completion
-- Display recommended tier based on quiz score:
-  * "strong" → Recommend Premium Package
-  * "moderate" → Recommend Standard Package
-  * "weak" → Recommend Consultation Only
-- Highlight "popular" tier with badge
-- Show discount badge: "{brand_content['pricing'].get('discount_badge', '')}"
-- Include feature lists for each tier
-- Add CTA buttons with tier-specific text
-- Use pricing cards with brand colors
-- Make it look professional and trustworthy
-"""
-
-        # Use custom colors if available, otherwise use brand defaults
-        colors = st.session_state.custom_colors if st.session_state.custom_colors else brand['colors']
-
-        prompt = f"""Create a complete, production-ready HTML landing page with inline CSS and JavaScript.
-{copy_guidance}
-{hero_image_instruction}
-{verified_content_instruction}
-{credentials_info}
-{trust_badges_info}
-{faq_info}
-{press_mentions_info}
-{eligibility_quiz_info}
-{video_testimonials_info}
-{live_chat_info}
-{multi_step_form_info}
-{calendar_integration_info}
-{email_automation_info}
-{crm_integration_info}
-{heatmap_tracking_info}
-{dynamic_pricing_info}
-
-BRAND INFORMATION:
-- Brand Name: {brand['name']}
-- Logo URL: {brand['logo']}
-- Primary Color: {colors['primary']}
-- Secondary Color: {colors['secondary']}
-- Accent Color: {colors['accent']}
-- Website: {brand['website']}{founder_info}
-
-PHILOSOPHY: {philosophy}
-{json.dumps(phil_info, indent=2)}
-
-DESIGN STYLE: {style}
-
-CALL-TO-ACTION:
-- Primary: {cta['primary']['text']} → {cta['primary']['url']}
-{'- Secondary: ' + cta.get('secondary', {}).get('text', '') + ' → ' + cta.get('secondary', {}).get('url', '') if 'secondary' in cta else ''}
-
-USER GOAL/INTENT:
-{intent}
-
-REQUIREMENTS:
-1. Fully responsive design (mobile-first)
-2. Modern, professional aesthetic matching the {style} style
-3. Use brand colors throughout
-4. Include logo in header
-5. Clear visual hierarchy
-6. Fast loading (inline all CSS/JS)
-7. Semantic HTML5
-8. Accessibility best practices
-9. Clear, compelling copy
-10. Strong call-to-action buttons with brand colors
-
-For Assessment-Driven Funnel philosophy, include:
-- Compelling hook (frustration or readiness based)
-- Subheading explaining the 15-question assessment
-- Value proposition about measuring 3 key areas
-- Credibility section
-- Prominent CTA to start the assessment
-
-Return ONLY the complete HTML code, no explanations or markdown formatting."""
+    # Load verified content for this brand
+    brand_content = load_verified_content(brand_id) if brand_id else EMPTY_CONTENT
 
-        response = client.messages.create(
-            model="claude-sonnet-4-20250514",
-            max_tokens=8000,
-            messages=[{"role": "user", "content": prompt}]
-        )
+    # Brand-specific sections, built once per config version
+    fragments = get_prompt_fragments(brand, brand_content)
 
-        html = response.content[0].text
+    # Use custom colors if available, otherwise use brand defaults
+    colors = st.session_state.custom_colors if st.session_state.custom_colors else brand.colors.as_dict()
 
-        # Clean markdown code blocks if present
-        if '```html' in html:
-            html = html.split('```html')[1].split('```')[0]
-        elif '```' in html:
-            html = html.split('```')[1].split('```')[0]
+    # Most to least stable: brand and philosophy, this session's choices, then the per-call feedback
+    return cached_messages(
+        landing_page_prefix(brand, fragments, philosophy, phil_json),
+        landing_page_session(colors, style, cta, intent, copy_preview, hero_image_url, integrations),
+        landing_page_suffix(feedback)
+    )
 
-        return html.strip()
-    except Exception as e:
-        st.error(f"Error generating landing page: {str(e)}")
-        return f"<html><body><h1>Error generating page: {str(e)}</h1></body></html>"
+def write_landing_page(client, system, messages, on_text):
+    """Stream one landing page through on_text and return (html, usage); makes no st calls, so it can run in a worker thread"""
+    with client.messages.stream(
+        model="claude-sonnet-4-20250514",
+        max_tokens=8000,
+        system=system,
+        messages=messages,
+        stop_sequences=[END_OF_DOCUMENT]
+    ) as stream:
+        for text in stream.text_stream:
+            on_text(text)
+        response = stream.get_final_message()
+
+    html = response.content[0].text
+    # The stop sequence itself is not part of the response
+    if response.stop_reason == "stop_sequence":
+        html += response.stop_sequence
+
+    return clean_html_output(html), response.usage
 
-def generate_image(brand, intent, style):
-    """Generate hero image using DALL-E"""
+def error_page(error):
+    return f"<html><body><h1>Error generating page: {error}</h1></body></html>"
+
+# Typical size of a generated page, used to estimate streaming progress
+EXPECTED_PAGE_CHARS = 25000
+
+# Seconds between progress and preview redraws while pages stream in
+LIVE_PREVIEW_INTERVAL = 0.5
+
+# Landing pages generated at once unless MAX_PARALLEL_GENERATIONS is set
+DEFAULT_PARALLEL_GENERATIONS = 3
+
+def generation_concurrency():
+    """How many landing page variations may be generated at once"""
     try:
-        api_key = get_secret('OPENAI_API_KEY')
-        if not api_key:
-            st.error("OPENAI_API_KEY not set in secrets or environment")
-            return None
+        return max(1, int(get_secret('MAX_PARALLEL_GENERATIONS') or DEFAULT_PARALLEL_GENERATIONS))
+    except ValueError:
+        return DEFAULT_PARALLEL_GENERATIONS
+
+def generate_variations(variation_requests, labels, preview_colors=None):
+    """
+    Generate several landing pages concurrently, at most generation_concurrency() at a time.
+
+    variation_requests maps each variation to the (system, messages) from landing_page_messages.
+    The first request writes the shared prompt prefix to the cache, so the rest are held back until
+    it starts streaming and then read the prefix instead of each writing their own copy. Each variation gets
+    its own progress bar, and the first one is previewed live as it streams in; with preview_colors
+    given, a pending hero image previews as the gradient fallback. Returns {variation: {"html",
+    "error", "usage", "cost", "seconds"}}; a failed variation gets an error page and its error
+    message while the others keep their results.
+    """
+    results = {}
+    api_key = get_secret('ANTHROPIC_API_KEY')
+    if not api_key:
+        for variation in variation_requests:
+            results[variation] = {"html": "<html><body><h1>Error: API key missing</h1></body></html>",
+                                  "error": "ANTHROPIC_API_KEY not set in secrets or environment",
+                                  "usage": None, "cost": 0.0, "seconds": 0.0}
+        return results
+
+    client = Anthropic(api_key=api_key)
+    streamed = {variation: [] for variation in variation_requests}
+    started = {}
+
+    def run(variation, system, messages):
+        # Worker thread: only appends to its own buffer, the script thread does all drawing
+        started[variation] = time.perf_counter()
+        html, usage = write_landing_page(client, system, messages, streamed[variation].append)
+        return html, usage, time.perf_counter() - started[variation]
+
+    preview_variation = next(iter(variation_requests))
+    bars = {
+        variation: st.progress(0, text=f"{labels[variation]}: " + (
+            "queued" if variation == preview_variation else "waiting for the prompt cache"))
+        for variation in variation_requests
+    }
+    preview_placeholder = st.empty()
+
+    with ThreadPoolExecutor(max_workers=generation_concurrency()) as executor:
+        futures = {}
+        held_back = list(variation_requests.items())
+        variation, (system, messages) = held_back.pop(0)
+        futures[executor.submit(run, variation, system, messages)] = variation
+        pending = set(futures)
+        while pending or held_back:
+            if held_back and (streamed[preview_variation] or preview_variation in results):
+                for variation, (system, messages) in held_back:
+                    future = executor.submit(run, variation, system, messages)
+                    futures[future] = variation
+                    pending.add(future)
+                held_back = []
+                for variation in variation_requests:
+                    if variation not in started:
+                        bars[variation].progress(0, text=f"{labels[variation]}: queued")
+
+            done, pending = wait(pending, timeout=LIVE_PREVIEW_INTERVAL, return_when=FIRST_COMPLETED)
+            for future in done:
+                variation = futures[future]
+                try:
+                    html, usage, seconds = future.result()
+                    results[variation] = {"html": html, "error": None, "usage": usage, "cost": usage_cost(usage),
+                                          "seconds": seconds}
+                    record_prompt_cache_usage(f"landing_page_{variation.lower()}", usage)
+                    bars[variation].progress(100, text=f"✅ {labels[variation]}: done in {seconds:.0f}s")
+                except Exception as e:
+                    seconds = time.perf_counter() - started.get(variation, time.perf_counter())
+                    results[variation] = {"html": error_page(str(e)), "error": str(e), "usage": None,
+                                          "cost": 0.0, "seconds": seconds}
+                    bars[variation].progress(100, text=f"❌ {labels[variation]}: failed - {str(e)}")
+
+            for future in pending:
+                variation = futures[future]
+                if variation not in started:
+                    continue
+                characters = sum(len(chunk) for chunk in list(streamed[variation]))
+                fraction = min(characters / EXPECTED_PAGE_CHARS, 0.99)
+                bars[variation].progress(int(100 * fraction), text=f"🎨 {labels[variation]}: {characters:,} characters "
+                                                                 f"in {time.perf_counter() - started[variation]:.0f}s")
+
+            if preview_variation in results:
+                preview_placeholder.empty()
+            elif streamed[preview_variation]:
+                preview = clean_html_output(''.join(list(streamed[preview_variation])))
+                if preview_colors:
+                    preview = substitute_hero_image(preview, None, preview_colors)
+                with preview_placeholder.container():
+                    st.caption(f"Live preview of {labels[preview_variation]} - updates as the page is written")
+                    st.components.v1.html(preview, height=600, scrolling=True)
+
+    preview_placeholder.empty()
+    return results
+
+def variant_names():
+    """Step 10's variations: the approved copy first, then each selected test angle"""
+    if not st.session_state.ab_testing:
+        return ['control']
+    return ['control'] + [angle for angle in st.session_state.variant_angles if angle in VARIANT_ANGLES]
+
+def variant_label(name):
+    """Display name like 'Version B - Pain Points'; letters follow the order of variant_names()"""
+    if not st.session_state.ab_testing:
+        return "Landing page"
+    letter = chr(ord('A') + variant_names().index(name))
+    return f"Version {letter} - {'Approved Copy' if name == 'control' else VARIANT_ANGLES[name]['label']}"
+
+def variant_html(name):
+    return st.session_state.html if name == 'control' else st.session_state.variants.get(name)
+
+def set_variant_html(name, html):
+    if name == 'control':
+        st.session_state.html = html
+    else:
+        st.session_state.variants[name] = html
+
+def variant_filename(name):
+    letter = chr(ord('A') + variant_names().index(name))
+    return f"landing-{st.session_state.brand}-{letter}-{name.replace('_', '-')}.html"
+
+def variants_zip():
+    """ZIP of every variation's HTML with a manifest of each one's angle, directive, cost and latency"""
+    manifest = []
+    zip_buffer = io.BytesIO()
+    with zipfile.ZipFile(zip_buffer, 'w', zipfile.ZIP_DEFLATED) as zf:
+        for name in variant_names():
+            html = variant_html(name)
+            if not html:
+                continue
+            zf.writestr(variant_filename(name), html)
+            stats = st.session_state.variant_stats.get(name, {})
+            manifest.append({
+                "file": variant_filename(name),
+                "variation": variant_label(name),
+                "angle": name,
+                "directive": st.session_state.get('copy_feedback') if name == 'control' else VARIANT_ANGLES[name]['directive'],
+                "seconds": round(stats.get('seconds', 0.0), 1),
+                "cost_usd": round(stats.get('cost', 0.0), 4),
+                "error": stats.get('error')
+            })
+        zf.writestr('manifest.json', json.dumps(manifest, indent=2))
+    return zip_buffer.getvalue()
+
+def render_variant_preview(name):
+    """Mobile/desktop preview of one variation, with its own toggle buttons"""
+    html = variant_html(name)
+    if st.session_state.ab_testing:
+        st.subheader(f"{variant_label(name)} Preview")
+    else:
+        st.subheader("Preview Your Landing Page")
 
-        client = openai.OpenAI(api_key=api_key)
+    # Preview mode toggle
+    col1, col2, col3, col4 = st.columns([1, 1, 1, 2])
+    with col1:
+        if st.button("📱 Mobile", use_container_width=True, type="primary" if st.session_state.preview_mode == 'mobile' else "secondary", key=f"mobile_preview_{name}"):
+            st.session_state.preview_mode = 'mobile'
+            st.rerun()
+    with col2:
+        if st.button("💻 Desktop", use_container_width=True, type="primary" if st.session_state.preview_mode == 'desktop' else "secondary", key=f"desktop_preview_{name}"):
+            st.session_state.preview_mode = 'desktop'
+            st.rerun()
+    with col3:
+        # Create data URI for opening in new tab
+        b64_html = base64.b64encode(html.encode()).decode()
+        href = f'data:text/html;base64,{b64_html}'
+        st.markdown(f'<a href="{href}" target="_blank"><button style="width:100%; padding:0.5rem; background:#667eea; color:white; border:none; border-radius:8px; font-weight:600; cursor:pointer;">🔗 New Tab</button></a>', unsafe_allow_html=True)
 
-        prompt = f"""Professional hero image for {brand['name']} landing page.
+    st.divider()
+
+    # Render preview based on mode
+    if st.session_state.preview_mode == 'mobile':
+        st.markdown("**Mobile View (375px)**")
+        st.markdown('<div class="mobile-frame">', unsafe_allow_html=True)
+        st.components.v1.html(html, height=800, scrolling=True)
+        st.markdown('</div>', unsafe_allow_html=True)
+    else:
+        st.markdown("**Desktop View (Full Width)**")
+        st.markdown('<div class="desktop-frame">', unsafe_allow_html=True)
+        st.components.v1.html(html, height=1000, scrolling=True)
+        st.markdown('</div>', unsafe_allow_html=True)
+
+def create_hero_image(api_key, brand, intent, style):
+    """Generate a hero image with DALL-E and return its URL; raises on failure and is safe to run in a worker thread"""
+    client = openai.OpenAI(api_key=api_key)
+
+    prompt = f"""Professional hero image for {brand.name} landing page.
 Style: {style}, modern, high-quality.
 Purpose: {intent[:200]}
-Color scheme: {brand['colors']['primary']} primary color.
+Color scheme: {brand.colors.primary} primary color.
 Professional photography style, clean composition, no text overlay, no people's faces.
 Corporate, trustworthy aesthetic."""
 
-        response = client.images.generate(
-            model="dall-e-3",
-            prompt=prompt,
-            size="1792x1024",
-            quality="hd",
-            n=1
-        )
-        return response.data[0].url
-    except Exception as e:
-        st.error(f"Error generating image: {str(e)}")
-        return None
+    response = client.images.generate(
+        model="dall-e-3",
+        prompt=prompt,
+        size="1792x1024",
+        quality="hd",
+        n=1
+    )
+    return response.data[0].url
 
 def deploy_to_netlify(html, subdomain):
     """Deploy HTML to Netlify"""
@@ -1037,6 +873,10 @@ st.divider()
 # START OVER BUTTON (Sidebar)
 # ============================================================================
 with st.sidebar:
+    # A config edit that failed validation: the last good version is still in use
+    for config_error in get_config_loader().errors + get_verified_content_store().errors:
+        st.warning(f"⚠️ Config edit ignored, using the previous version. {config_error}")
+
     st.markdown("### 🔄 Quick Actions")
     if st.button("🔄 Start New Landing Page", use_container_width=True, type="secondary"):
         # Reset all session state
@@ -1093,7 +933,7 @@ with st.sidebar:
         st.divider()
         st.markdown("### 📊 Current Settings")
         if st.session_state.get('brand_data'):
-            st.caption(f"**Brand:** {st.session_state.brand_data['name']}")
+            st.caption(f"**Brand:** {st.session_state.brand_data.name}")
         if st.session_state.get('philosophy'):
             st.caption(f"**Philosophy:** {st.session_state.philosophy}")
         if st.session_state.get('style'):
@@ -1173,24 +1013,22 @@ elif st.session_state.step == 2:
         for idx, (brand_id, brand) in enumerate(brands.items()):
             with cols[idx % 3]:
                 st.markdown('<div class="brand-card">', unsafe_allow_html=True)
-                st.image(brand['logo'], width=200)
-                st.subheader(brand['name'])
-                st.caption(brand['website'])
+                st.image(brand.logo, width=200)
+                st.subheader(brand.name)
+                st.caption(brand.website)
 
                 # Color preview banner
-                primary = brand['colors']['primary']
-                secondary = brand['colors']['secondary']
-                accent = brand['colors']['accent']
+                colors = brand.colors
                 st.markdown(
                     f'''<div style="display: flex; height: 40px; margin: 10px 0; border-radius: 8px; overflow: hidden; border: 2px solid #e0e0e0;">
-                        <div style="flex: 1; background-color: {primary}; display: flex; align-items: center; justify-content: center; color: {get_contrast_text_color(primary)}; font-size: 0.75rem; font-weight: bold;">PRIMARY</div>
-                        <div style="flex: 1; background-color: {secondary}; display: flex; align-items: center; justify-content: center; color: {get_contrast_text_color(secondary)}; font-size: 0.75rem; font-weight: bold;">SECONDARY</div>
-                        <div style="flex: 1; background-color: {accent}; display: flex; align-items: center; justify-content: center; color: {get_contrast_text_color(accent)}; font-size: 0.75rem; font-weight: bold;">ACCENT</div>
+                        <div style="flex: 1; background-color: {colors.primary}; display: flex; align-items: center; justify-content: center; color: {colors.primary_text}; font-size: 0.75rem; font-weight: bold;">PRIMARY</div>
+                        <div style="flex: 1; background-color: {colors.secondary}; display: flex; align-items: center; justify-content: center; color: {colors.secondary_text}; font-size: 0.75rem; font-weight: bold;">SECONDARY</div>
+                        <div style="flex: 1; background-color: {colors.accent}; display: flex; align-items: center; justify-content: center; color: {colors.accent_text}; font-size: 0.75rem; font-weight: bold;">ACCENT</div>
                     </div>''',
                     unsafe_allow_html=True
                 )
 
-                if st.button(f"Select {brand['name']}", key=brand_id, use_container_width=True, type="primary"):
+                if st.button(f"Select {brand.name}", key=brand_id, use_container_width=True, type="primary"):
                     st.session_state.brand = brand_id
                     st.session_state.brand_data = brand
                     st.session_state.step = 3
@@ -1210,7 +1048,7 @@ elif st.session_state.step == 2:
 # ============================================================================
 elif st.session_state.step == 3:
     st.markdown('<div class="main-header">Choose Your Philosophy</div>', unsafe_allow_html=True)
-    st.caption(f"Brand: {st.session_state.brand_data['name']}")
+    st.caption(f"Brand: {st.session_state.brand_data.name}")
 
     philosophies = {
         'assessment-funnel': {
@@ -1298,7 +1136,7 @@ elif st.session_state.step == 3:
 # ============================================================================
 elif st.session_state.step == 4:
     st.markdown('<div class="main-header">Choose Your Style</div>', unsafe_allow_html=True)
-    st.caption(f"Brand: {st.session_state.brand_data['name']} | Philosophy: {st.session_state.philosophy}")
+    st.caption(f"Brand: {st.session_state.brand_data.name} | Philosophy: {st.session_state.philosophy}")
 
     styles = {
         'professional': {
@@ -1364,7 +1202,7 @@ elif st.session_state.step == 4:
         with col1:
             primary_color = st.color_picker(
                 "Primary Color",
-                value=st.session_state.custom_colors['primary'] if st.session_state.custom_colors else brand['colors']['primary'],
+                value=st.session_state.custom_colors['primary'] if st.session_state.custom_colors else brand.colors.primary,
                 help="Used for main buttons and headers",
                 key="primary_color_picker"
             )
@@ -1372,7 +1210,7 @@ elif st.session_state.step == 4:
         with col2:
             secondary_color = st.color_picker(
                 "Secondary Color",
-                value=st.session_state.custom_colors['secondary'] if st.session_state.custom_colors else brand['colors']['secondary'],
+                value=st.session_state.custom_colors['secondary'] if st.session_state.custom_colors else brand.colors.secondary,
                 help="Used for backgrounds and accents",
                 key="secondary_color_picker"
             )
@@ -1380,7 +1218,7 @@ elif st.session_state.step == 4:
         with col3:
             accent_color = st.color_picker(
                 "Accent Color",
-                value=st.session_state.custom_colors['accent'] if st.session_state.custom_colors else brand['colors']['accent'],
+                value=st.session_state.custom_colors['accent'] if st.session_state.custom_colors else brand.colors.accent,
                 help="Used for highlights and special elements",
                 key="accent_color_picker"
             )
@@ -1445,7 +1283,7 @@ elif st.session_state.step == 4:
 # ============================================================================
 elif st.session_state.step == 5:
     st.markdown('<div class="main-header">⚡ Configure Call-to-Action</div>', unsafe_allow_html=True)
-    st.caption(f"Brand: {st.session_state.brand_data['name']} | Style: {st.session_state.style}")
+    st.caption(f"Brand: {st.session_state.brand_data.name} | Style: {st.session_state.style}")
 
     brand = st.session_state.brand_data
     phil = st.session_state.philosophy
@@ -1453,10 +1291,10 @@ elif st.session_state.step == 5:
     # Default CTA based on philosophy (only if not already set)
     if phil == 'assessment-funnel':
         default_text = "Take the Free Assessment"
-        default_url = brand['ctas']['top']['url']
+        default_url = brand.ctas['top'].url
     else:
-        default_text = brand['ctas']['middle']['text']
-        default_url = brand['ctas']['middle']['url']
+        default_text = brand.ctas['middle'].text
+        default_url = brand.ctas['middle'].url
 
     # Use session state to preserve values if already set
     if 'cta_text_value' not in st.session_state:
@@ -1493,7 +1331,7 @@ elif st.session_state.step == 5:
 
     # Preview - use custom colors if available
     st.markdown("**Preview:**")
-    preview_color = st.session_state.custom_colors['primary'] if st.session_state.custom_colors else brand['colors']['primary']
+    preview_color = st.session_state.custom_colors['primary'] if st.session_state.custom_colors else brand.colors.primary
     st.markdown(
         f'<a href="#" style="background-color: {preview_color}; color: white; padding: 12px 24px; text-decoration: none; border-radius: 6px; display: inline-block; font-weight: 600;">{cta_text}</a>',
         unsafe_allow_html=True
@@ -1518,7 +1356,7 @@ elif st.session_state.step == 5:
         with col2:
             sec_url = st.text_input(
                 "Secondary URL",
-                value=brand['website'],
+                value=brand.website,
                 key="sec_cta_url",
                 placeholder="https://example.com"
             )
@@ -1813,16 +1651,32 @@ elif st.session_state.step == 9:
 
         st.divider()
 
-        # A/B Testing Option
+        # A/B and multivariate testing option
         st.markdown("### 🧪 A/B Testing (Optional)")
         ab_test = st.checkbox(
-            "Generate 2 variations for A/B testing",
-            help="Creates Version A and Version B with different headlines and copy approaches",
+            "Generate variations for A/B testing",
+            help="Creates Version A from your approved copy plus one variation per copy angle you pick",
             key="ab_test_checkbox"
         )
         if ab_test:
-            st.info("💡 We'll generate 2 landing page variations:\n- **Version A**: Focus on benefits and results\n- **Version B**: Focus on pain points and urgency")
-            st.session_state.ab_testing = True
+            angles = st.multiselect(
+                "Copy angles to test",
+                options=list(VARIANT_ANGLES),
+                default=st.session_state.variant_angles,
+                format_func=lambda angle: VARIANT_ANGLES[angle]['label'],
+                help="Each angle becomes its own landing page; all of them are generated at the same time",
+                key="variant_angles_select"
+            )
+            st.session_state.variant_angles = angles
+            st.session_state.ab_testing = bool(angles)
+            if angles:
+                lines = ["- **Version A**: Your approved copy"] + [
+                    f"- **Version {chr(ord('B') + index)}**: {VARIANT_ANGLES[angle]['label']}"
+                    for index, angle in enumerate(angles)
+                ]
+                st.info(f"💡 We'll generate {len(angles) + 1} landing page variations:\n" + "\n".join(lines))
+            else:
+                st.warning("Pick at least one copy angle to test against your approved copy")
         else:
             st.session_state.ab_testing = False
 
@@ -1853,124 +1707,170 @@ elif st.session_state.step == 9:
 elif st.session_state.step == 10:
     st.markdown('<div class="main-header">Generate Your Landing Page</div>', unsafe_allow_html=True)
 
-    # Generate if not already generated
-    if not st.session_state.get('html'):
+    # Generate every variation that has not been generated yet
+    missing_variants = [name for name in variant_names() if not variant_html(name)]
+    if missing_variants:
         # Show estimated total time
         estimated_time = 15  # Base time for HTML generation
+        batches = -(-len(missing_variants) // generation_concurrency())
+        estimated_time += 20 * (batches - 1)  # Variations beyond the concurrency limit wait for a free slot
         if st.session_state.media.get('generate_image'):
-            estimated_time += 45  # Add time for image generation
-        if st.session_state.ab_testing:
-            estimated_time += 20  # Add time for variation B
+            estimated_time = max(estimated_time, 45)  # The image is generated while the HTML is written
 
         st.info(f"⏱️ Estimated generation time: {estimated_time}-{estimated_time + 30} seconds")
 
         progress_bar = st.progress(0)
         status_text = st.empty()
 
-        # Generate media FIRST if requested
-        if st.session_state.media.get('generate_image'):
-            status_text.text("🖼️ Generating hero image with DALL-E 3... ⏱️ 30-60 seconds")
-            progress_bar.progress(25)
-            try:
-                image_url = generate_image(
-                    brand=st.session_state.brand_data,
-                    intent=st.session_state.intent_raw,
-                    style=st.session_state.style
+        page_colors = st.session_state.custom_colors or st.session_state.brand_data.colors.as_dict()
+
+        # Start the hero image in the background; the HTML refers to it by a placeholder until it is ready
+        hero_image_url = st.session_state.get('generated_image')
+        image_executor = None
+        image_future = None
+        if st.session_state.media.get('generate_image') and not hero_image_url:
+            openai_key = get_secret('OPENAI_API_KEY')
+            if openai_key:
+                image_executor = ThreadPoolExecutor(max_workers=1)
+                image_future = image_executor.submit(
+                    create_hero_image,
+                    openai_key,
+                    st.session_state.brand_data,
+                    st.session_state.intent_raw,
+                    st.session_state.style
                 )
-                if image_url:
-                    st.session_state.generated_image = image_url
-                    st.success(f"✅ Hero image generated!")
-            except Exception as e:
-                st.warning(f"⚠️ Image generation failed: {str(e)}")
-            progress_bar.progress(50)
-
-        # Generate HTML with the hero image
-        status_text.text("🎨 Generating your landing page HTML... ⏱️ 15-30 seconds")
-        progress_bar.progress(75)
-
-        html = generate_landing_page(
-            brand=st.session_state.brand_data,
-            philosophy=st.session_state.philosophy,
-            style=st.session_state.style,
-            cta=st.session_state.cta,
-            intent=st.session_state.intent_raw,
-            copy_preview=st.session_state.get('copy_preview'),
-            feedback=st.session_state.get('copy_feedback'),
-            hero_image_url=st.session_state.get('generated_image'),
-            brand_id=st.session_state.brand,
-            integrations=st.session_state.get('integrations', {})
-        )
-        st.session_state.html = html
-
-        # Generate Variation B if A/B testing is enabled
-        if st.session_state.ab_testing and not st.session_state.get('variation_b'):
-            status_text.text("🧪 Generating Variation B for A/B testing... ⏱️ 15-30 seconds")
-            progress_bar.progress(85)
+                hero_image_url = HERO_IMAGE_PLACEHOLDER
+            else:
+                st.error("OPENAI_API_KEY not set in secrets or environment")
 
-            # Create alternative copy guidance for Variation B
-            variation_b_feedback = "Create a DIFFERENT approach: Focus on pain points, urgency, and what they're losing by not taking action. Use more emotional triggers and scarcity."
+        # Generate HTML with the hero image; test variations are written at the same time
+        if image_future:
+            status_text.text("🎨 Generating your landing page HTML and hero image... ⏱️ 30-60 seconds")
+        else:
+            status_text.text("🎨 Generating your landing page HTML... ⏱️ 15-30 seconds")
+        progress_bar.progress(10)
 
-            variation_b_html = generate_landing_page(
+        # Variations differ only in their feedback, so they share the cached prompt layers before it
+        variation_requests = {
+            name: landing_page_messages(
                 brand=st.session_state.brand_data,
                 philosophy=st.session_state.philosophy,
                 style=st.session_state.style,
                 cta=st.session_state.cta,
                 intent=st.session_state.intent_raw,
                 copy_preview=st.session_state.get('copy_preview'),
-                feedback=variation_b_feedback,
-                hero_image_url=st.session_state.get('generated_image'),
+                feedback=st.session_state.get('copy_feedback') if name == 'control' else VARIANT_ANGLES[name]['directive'],
+                hero_image_url=hero_image_url,
                 brand_id=st.session_state.brand,
                 integrations=st.session_state.get('integrations', {})
             )
-            st.session_state.variation_b = variation_b_html
+            for name in missing_variants
+        }
+        results = generate_variations(variation_requests, {name: variant_label(name) for name in missing_variants},
+                                      page_colors if image_future else None)
+
+        failed = []
+        for name, result in results.items():
+            # A failed variation keeps an empty slot, so the next run generates it again
+            if result['error']:
+                failed.append(variant_label(name))
+                st.error(f"Error generating {variant_label(name)}: {result['error']}")
+            else:
+                set_variant_html(name, result['html'])
+            usage = result['usage']
+            st.session_state.variant_stats[name] = {
+                "seconds": result['seconds'],
+                "cost": result['cost'],
+                "input_tokens": usage.input_tokens if usage else 0,
+                "cache_read_input_tokens": (getattr(usage, 'cache_read_input_tokens', None) or 0) if usage else 0,
+                "output_tokens": usage.output_tokens if usage else 0,
+                "error": result['error']
+            }
+
+        # Swap the real hero image (or a gradient, if it failed) in for the placeholder
+        if image_future:
+            status_text.text("🖼️ Finishing the hero image with DALL-E 3...")
+            progress_bar.progress(90)
+            image_url = None
+            try:
+                image_url = image_future.result()
+                st.session_state.generated_image = image_url
+                st.success("✅ Hero image generated!")
+            except Exception as e:
+                st.warning(f"⚠️ Image generation failed: {str(e)} - using a gradient hero instead")
+            image_executor.shutdown(wait=False)
+
+            for name in missing_variants:
+                if variant_html(name):
+                    set_variant_html(name, substitute_hero_image(variant_html(name), image_url, page_colors))
 
         progress_bar.progress(100)
-        if st.session_state.ab_testing:
-            status_text.text("✅ Both variations generated successfully!")
+        if failed:
+            status_text.text(f"⚠️ {', '.join(failed)} failed - the other results are kept below")
+        elif st.session_state.ab_testing:
+            status_text.text(f"✅ All {len(variant_names())} variations generated successfully!")
         else:
             status_text.text("✅ Landing page generated successfully!")
 
         # Track analytics
         track_analytics_event("html_generated", {
             "ab_testing": st.session_state.ab_testing,
+            "variants": variant_names(),
             "has_image": bool(st.session_state.get('generated_image'))
         })
 
+    # Failed variations have no HTML; they are left out of previews, downloads and deploys
+    ready_variants = [name for name in variant_names() if variant_html(name)]
+    failed_variants = [name for name in variant_names() if not variant_html(name)]
+    if failed_variants:
+        st.warning(f"⚠️ Not generated: {', '.join(variant_label(name) for name in failed_variants)}")
+        if st.button("🔄 Retry Failed Variations", type="primary"):
+            st.rerun()
+    if not ready_variants:
+        st.stop()
+    main_variant = 'control' if 'control' in ready_variants else ready_variants[0]
+
     if st.session_state.ab_testing:
-        st.success("✅ Your A/B test variations are ready!")
+        st.success(f"✅ {len(ready_variants)} of your {len(variant_names())} A/B test variations are ready!")
     else:
         st.success("✅ Your landing page is ready!")
 
     # Prominent Download Button(s)
     if st.session_state.ab_testing:
         st.markdown("### 📥 Download Your A/B Test Variations")
-        col1, col2 = st.columns(2)
-
-        with col1:
-            st.markdown("#### 🅰️ Version A - Benefits Focused")
-            st.download_button(
-                label="⬇️ Download Version A",
-                data=st.session_state.html,
-                file_name=f"landing-{st.session_state.brand}-A-{datetime.now().strftime('%Y%m%d-%H%M')}.html",
-                mime="text/html",
-                use_container_width=True,
-                type="primary",
-                help="Benefits and results-focused approach",
-                key="download_variation_a"
-            )
+        st.download_button(
+            label=f"⬇️ Download All {len(ready_variants)} Variations (ZIP)",
+            data=variants_zip(),
+            file_name=f"landing-{st.session_state.brand}-variations-{datetime.now().strftime('%Y%m%d-%H%M')}.zip",
+            mime="application/zip",
+            use_container_width=True,
+            type="primary",
+            help="Every variation's HTML plus a manifest.json with its copy angle, cost and generation time",
+            key="download_all_variations"
+        )
 
-        with col2:
-            st.markdown("#### 🅱️ Version B - Pain Points & Urgency")
-            st.download_button(
-                label="⬇️ Download Version B",
-                data=st.session_state.variation_b,
-                file_name=f"landing-{st.session_state.brand}-B-{datetime.now().strftime('%Y%m%d-%H%M')}.html",
-                mime="text/html",
-                use_container_width=True,
-                type="primary",
-                help="Pain points and urgency-focused approach",
-                key="download_variation_b"
-            )
+        columns = st.columns(min(len(variant_names()), 3))
+        for index, name in enumerate(variant_names()):
+            with columns[index % len(columns)]:
+                st.markdown(f"#### {variant_label(name)}")
+                if name in failed_variants:
+                    st.caption("❌ Generation failed - retry above")
+                    continue
+                st.download_button(
+                    label="⬇️ Download",
+                    data=variant_html(name),
+                    file_name=variant_filename(name),
+                    mime="text/html",
+                    use_container_width=True,
+                    help="Copy directive: " + (st.session_state.get('copy_feedback') or "your approved copy"
+                                               if name == 'control' else VARIANT_ANGLES[name]['directive']),
+                    key=f"download_variation_{name}"
+                )
+                if st.button("🚀 Deploy", use_container_width=True, key=f"deploy_variation_{name}"):
+                    st.session_state.deploy_variant = name
+                    st.session_state.show_netlify_form = True
+                if st.session_state.deployed_urls.get(name):
+                    st.caption(f"Live at {st.session_state.deployed_urls[name]}")
     else:
         st.markdown("### 📥 Download Your Landing Page")
         col1, col2, col3 = st.columns([2, 1, 1])
@@ -1993,100 +1893,66 @@ elif st.session_state.step == 10:
 
     st.divider()
 
+    # Cost and latency of each variation's generation
+    if st.session_state.variant_stats:
+        with st.expander("📊 Generation Cost & Latency", expanded=st.session_state.ab_testing):
+            rows = []
+            for name in variant_names():
+                stats = st.session_state.variant_stats.get(name)
+                if not stats:
+                    continue
+                rows.append({
+                    "Variation": variant_label(name),
+                    "Status": "❌ Failed" if stats['error'] else "✅ Done",
+                    "Seconds": round(stats['seconds'], 1),
+                    "Cached input tokens": stats['cache_read_input_tokens'],
+                    "Other input tokens": stats['input_tokens'],
+                    "Output tokens": stats['output_tokens'],
+                    "Est. cost (USD)": round(stats['cost'], 4)
+                })
+            st.dataframe(rows, hide_index=True, use_container_width=True)
+            st.caption(f"Total estimated cost: ${sum(row['Est. cost (USD)'] for row in rows):.4f} "
+                       f"at Claude Sonnet 4 list prices")
+
+    # Prompt cache effectiveness for this session's Claude calls
+    if st.session_state.get('prompt_cache_usage'):
+        with st.expander("⚡ Prompt Cache", expanded=False):
+            for usage in st.session_state.prompt_cache_usage:
+                st.caption(
+                    f"**{usage['call'].replace('_', ' ').title()}:** "
+                    f"{usage['cache_read_input_tokens']:,} tokens read from cache, "
+                    f"{usage['cache_creation_input_tokens']:,} written, "
+                    f"{usage['input_tokens']:,} uncached, {usage['output_tokens']:,} output"
+                )
+
     # Show generated image if available
     if st.session_state.get('generated_image'):
         with st.expander("🖼️ Generated Hero Image", expanded=False):
             st.image(st.session_state.generated_image, caption="AI-Generated Hero Image")
             st.caption("This image has been generated and can be downloaded or used in your landing page.")
 
-    # Preview tabs
+    # Preview tabs: one per variation, then code and editor
     if st.session_state.ab_testing:
-        tab1, tab2, tab3, tab4 = st.tabs(["👁️ Preview Version A", "👁️ Preview Version B", "💻 HTML Code", "✏️ Edit HTML"])
+        preview_tab_labels = [f"👁️ Preview {variant_label(name).split(' - ')[0]}" for name in ready_variants]
     else:
-        tab1, tab2, tab3 = st.tabs(["👁️ Live Preview", "💻 HTML Code", "✏️ Edit HTML"])
+        preview_tab_labels = ["👁️ Live Preview"]
+    tabs = st.tabs(preview_tab_labels + ["💻 HTML Code", "✏️ Edit HTML"])
 
-    with tab1:
-        if st.session_state.ab_testing:
-            st.subheader("🅰️ Version A Preview - Benefits Focused")
-        else:
-            st.subheader("Preview Your Landing Page")
+    for name, tab in zip(ready_variants, tabs):
+        with tab:
+            render_variant_preview(name)
 
-        # Preview mode toggle
-        col1, col2, col3, col4 = st.columns([1, 1, 1, 2])
-        with col1:
-            if st.button("📱 Mobile", use_container_width=True, type="primary" if st.session_state.preview_mode == 'mobile' else "secondary", key="mobile_preview_a"):
-                st.session_state.preview_mode = 'mobile'
-                st.rerun()
-        with col2:
-            if st.button("💻 Desktop", use_container_width=True, type="primary" if st.session_state.preview_mode == 'desktop' else "secondary", key="desktop_preview_a"):
-                st.session_state.preview_mode = 'desktop'
-                st.rerun()
-        with col3:
-            # Create data URI for opening in new tab
-            import base64
-            b64_html = base64.b64encode(st.session_state.html.encode()).decode()
-            href = f'data:text/html;base64,{b64_html}'
-            st.markdown(f'<a href="{href}" target="_blank"><button style="width:100%; padding:0.5rem; background:#667eea; color:white; border:none; border-radius:8px; font-weight:600; cursor:pointer;">🔗 New Tab</button></a>', unsafe_allow_html=True)
-
-        st.divider()
+    # Select a variation for the code and editor tabs when testing
+    variant_options = {variant_label(name): name for name in ready_variants}
 
-        # Render preview based on mode
-        if st.session_state.preview_mode == 'mobile':
-            st.markdown("**Mobile View (375px)**")
-            st.markdown('<div class="mobile-frame">', unsafe_allow_html=True)
-            st.components.v1.html(st.session_state.html, height=800, scrolling=True)
-            st.markdown('</div>', unsafe_allow_html=True)
-        else:
-            st.markdown("**Desktop View (Full Width)**")
-            st.markdown('<div class="desktop-frame">', unsafe_allow_html=True)
-            st.components.v1.html(st.session_state.html, height=1000, scrolling=True)
-            st.markdown('</div>', unsafe_allow_html=True)
-
-    # Version B preview tab (only if A/B testing)
-    if st.session_state.ab_testing:
-        with tab2:
-            st.subheader("🅱️ Version B Preview - Pain Points & Urgency")
-
-            # Preview mode toggle for B
-            col1, col2, col3, col4 = st.columns([1, 1, 1, 2])
-            with col1:
-                if st.button("📱 Mobile", use_container_width=True, type="primary" if st.session_state.preview_mode == 'mobile' else "secondary", key="mobile_preview_b"):
-                    st.session_state.preview_mode = 'mobile'
-                    st.rerun()
-            with col2:
-                if st.button("💻 Desktop", use_container_width=True, type="primary" if st.session_state.preview_mode == 'desktop' else "secondary", key="desktop_preview_b"):
-                    st.session_state.preview_mode = 'desktop'
-                    st.rerun()
-            with col3:
-                # Create data URI for opening in new tab
-                import base64
-                b64_html_b = base64.b64encode(st.session_state.variation_b.encode()).decode()
-                href_b = f'data:text/html;base64,{b64_html_b}'
-                st.markdown(f'<a href="{href_b}" target="_blank"><button style="width:100%; padding:0.5rem; background:#667eea; color:white; border:none; border-radius:8px; font-weight:600; cursor:pointer;">🔗 New Tab</button></a>', unsafe_allow_html=True)
-
-            st.divider()
-
-            # Render preview based on mode
-            if st.session_state.preview_mode == 'mobile':
-                st.markdown("**Mobile View (375px)**")
-                st.markdown('<div class="mobile-frame">', unsafe_allow_html=True)
-                st.components.v1.html(st.session_state.variation_b, height=800, scrolling=True)
-                st.markdown('</div>', unsafe_allow_html=True)
-            else:
-                st.markdown("**Desktop View (Full Width)**")
-                st.markdown('<div class="desktop-frame">', unsafe_allow_html=True)
-                st.components.v1.html(st.session_state.variation_b, height=1000, scrolling=True)
-                st.markdown('</div>', unsafe_allow_html=True)
-
-    # HTML Code tab - use correct tab number based on A/B testing
-    html_code_tab = tab3 if st.session_state.ab_testing else tab2
+    html_code_tab = tabs[len(ready_variants)]
     with html_code_tab:
         st.subheader("HTML Source Code")
         if st.session_state.ab_testing:
-            version_select = st.radio("Select Version:", ["Version A", "Version B"], horizontal=True)
-            html_to_show = st.session_state.variation_b if version_select == "Version B" else st.session_state.html
+            version_select = st.radio("Select Version:", list(variant_options), horizontal=True)
+            html_to_show = variant_html(variant_options[version_select])
         else:
-            html_to_show = st.session_state.html
+            html_to_show = variant_html(main_variant)
 
         col1, col2 = st.columns([3, 1])
         with col2:
@@ -2094,31 +1960,27 @@ elif st.session_state.step == 10:
                 st.info("Use the download button to save the HTML file")
         st.code(html_to_show, language='html', line_numbers=True)
 
-    # Edit HTML tab - use correct tab number based on A/B testing
-    edit_html_tab = tab4 if st.session_state.ab_testing else tab3
+    edit_html_tab = tabs[len(ready_variants) + 1]
     with edit_html_tab:
         st.subheader("Edit HTML (Advanced)")
         st.warning("⚠️ Advanced feature: Edit the HTML code directly before deploying")
 
         if st.session_state.ab_testing:
-            version_edit = st.radio("Select Version to Edit:", ["Version A", "Version B"], horizontal=True, key="edit_version_select")
-            html_to_edit = st.session_state.variation_b if version_edit == "Version B" else st.session_state.html
-            edit_key = "html_editor_b" if version_edit == "Version B" else "html_editor_a"
+            version_edit = st.radio("Select Version to Edit:", list(variant_options), horizontal=True, key="edit_version_select")
+            variant_to_edit = variant_options[version_edit]
+            edit_key = f"html_editor_{variant_to_edit}"
         else:
-            html_to_edit = st.session_state.html
+            variant_to_edit = main_variant
             edit_key = "html_editor"
 
         edited_html = st.text_area(
             "HTML Code",
-            value=html_to_edit,
+            value=variant_html(variant_to_edit),
             height=400,
             key=edit_key
         )
         if st.button("💾 Update Preview", type="primary", key=f"update_{edit_key}"):
-            if st.session_state.ab_testing and version_edit == "Version B":
-                st.session_state.variation_b = edited_html
-            else:
-                st.session_state.html = edited_html
+            set_variant_html(variant_to_edit, edited_html)
             st.success("✅ HTML updated! Switch to Preview tab to see changes.")
             st.rerun()
 
@@ -2131,7 +1993,7 @@ elif st.session_state.step == 10:
     with col1:
         st.download_button(
             label="📥 Download HTML",
-            data=st.session_state.html,
+            data=variant_html(main_variant),
             file_name=f"landing-{st.session_state.brand}-{datetime.now().strftime('%Y%m%d-%H%M')}.html",
             mime="text/html",
             use_container_width=True,
@@ -2140,6 +2002,7 @@ elif st.session_state.step == 10:
 
     with col2:
         if st.button("🚀 Deploy to Netlify", use_container_width=True):
+            st.session_state.deploy_variant = main_variant
             st.session_state.show_netlify_form = True
 
     with col3:
@@ -2147,10 +2010,10 @@ elif st.session_state.step == 10:
             with st.spinner("Saving to Airtable..."):
                 result = save_to_airtable({
                     'campaign': st.session_state.intent_raw[:50],
-                    'brand': st.session_state.brand_data['name'],
+                    'brand': st.session_state.brand_data.name,
                     'philosophy': st.session_state.philosophy,
                     'style': st.session_state.style,
-                    'html': st.session_state.html,
+                    'html': variant_html(main_variant),
                     'url': st.session_state.get('deployed_url', '')
                 })
                 if result:
@@ -2168,9 +2031,16 @@ elif st.session_state.step == 10:
     # Netlify deployment form
     if st.session_state.get('show_netlify_form'):
         st.divider()
-        st.subheader("Deploy to Netlify")
-
-        default_subdomain = f"{st.session_state.brand}-{datetime.now().strftime('%Y%m%d-%H%M')}"
+        deploy_variant = st.session_state.get('deploy_variant', main_variant)
+        if deploy_variant not in ready_variants:
+            deploy_variant = main_variant
+        if st.session_state.ab_testing:
+            st.subheader(f"Deploy {variant_label(deploy_variant)} to Netlify")
+            default_subdomain = (f"{st.session_state.brand}-{deploy_variant.replace('_', '-')}-"
+                                 f"{datetime.now().strftime('%Y%m%d-%H%M')}")
+        else:
+            st.subheader("Deploy to Netlify")
+            default_subdomain = f"{st.session_state.brand}-{datetime.now().strftime('%Y%m%d-%H%M')}"
         subdomain = st.text_input(
             "Choose a subdomain",
             value=default_subdomain,
@@ -2186,13 +2056,15 @@ elif st.session_state.step == 10:
         with col2:
             if st.button("Deploy Now", type="primary", use_container_width=True, disabled=not subdomain):
                 with st.spinner("🚀 Deploying to Netlify..."):
-                    url = deploy_to_netlify(st.session_state.html, subdomain)
+                    url = deploy_to_netlify(variant_html(deploy_variant), subdomain)
                     if url:
-                        st.session_state.deployed_url = url
+                        if deploy_variant == 'control':
+                            st.session_state.deployed_url = url
+                        st.session_state.deployed_urls[deploy_variant] = url
                         st.success(f"✅ Deployed successfully!")
                         st.markdown(f"**Your landing page is live at:** [{url}]({url})")
                         # Track analytics
-                        track_analytics_event("deployed_to_netlify", {"url": url})
+                        track_analytics_event("deployed_to_netlify", {"url": url, "variant": deploy_variant})
                         st.balloons()
                     else:
                         st.error("❌ Deployment failed.")